@@ -1,6 +1,8 @@
 import asyncio
 import datetime
+import hashlib
 import logging
+import re
 import time
 from pathlib import Path
 from typing import Dict, List, Optional
@@ -47,13 +49,29 @@ _BOT_COMMANDS = [
     BotCommand(command="help", description="❓ Help"),
 ]
 
-SUPPORTED_FORMATS = [
+# Fingerprint of the command menu; start() skips SetBotCommandsRequest when
+# the stored fingerprint for this token matches.
+_BOT_COMMANDS_REPR = repr(_BOT_COMMANDS)
+
+
+def _bot_commands_digest(token: str) -> str:
+    return hashlib.sha256(f"{token}\n{_BOT_COMMANDS_REPR}".encode("utf-8")).hexdigest()
+
+
+SUPPORTED_FORMATS = (
     "npvt", "npvtsub", "ovpn", "npv4", "conf_lines",
     "ehi", "hc", "hat", "sip", "nm", "dark", "opaque_bundle",
-]
+)
 
 # All valid format names a user can request (includes derived formats)
-_ALL_VALID_FORMATS = SUPPORTED_FORMATS + ["b64sub", "decoded.json"]
+_ALL_VALID_FORMATS = frozenset(SUPPORTED_FORMATS) | {"b64sub", "decoded.json"}
+
+# Single pattern for every slash command; the captured name picks the handler.
+# The command must end at whitespace, end of text or an "@botname" mention, so
+# "/getall" and "/get-x" never trigger /get while "/get@GatherXBot" still does.
+_COMMAND_RE = re.compile(
+    r"(?i)^/(start|help|get|latest|formats|setformat|myinfo|mute|unmute)(?:@\w+)?(?:\s|$)"
+)
 
 # Formats to auto-deliver (the most useful ones)
 _AUTO_DELIVER_FORMATS = ("npvt", "b64sub")
@@ -76,6 +94,27 @@ _FORMAT_LABELS: Dict[str, str] = {
     "opaque_bundle": "📦 Binary bundle (ZIP)",
 }
 
+# Formats listed by /formats, grouped for display
+_TEXT_FORMATS = ("npvt", "npvtsub", "conf_lines", "b64sub", "decoded.json")
+_BINARY_FORMATS = ("ovpn", "npv4", "ehi", "hc", "hat", "sip", "nm", "dark")
+
+
+def _build_formats_text() -> str:
+    lines = ["📋 **Available Formats**\n"]
+    lines.append("**Text-based** (proxy URIs):")
+    for f in _TEXT_FORMATS:
+        lines.append(f"  `{f}` — {_FORMAT_LABELS.get(f, f)}")
+    lines.append("")
+    lines.append("**Binary configs** (ZIP archives):")
+    for f in _BINARY_FORMATS:
+        lines.append(f"  `{f}` — {_FORMAT_LABELS.get(f, f)}")
+    lines.append("\nUse `/get <format>` to download.")
+    return "\n".join(lines)
+
+
+# The /formats reply never changes, so it is rendered once at import
+_FORMATS_TEXT = _build_formats_text()
+
 
 # ── Bot class ─────────────────────────────────────────────────────────
 
@@ -92,8 +131,21 @@ class InteractiveBot:
         self._init_tables()
 
         session_path = DATA_DIR / "bot.session"
+        self._commands_hash_path = DATA_DIR / "bot_commands.hash"
         self.client = TelegramClient(str(session_path), self.api_id, self.api_hash)
 
+        self._dispatch = {
+            "start": self._on_start,
+            "help": self._on_help,
+            "get": self._on_get,
+            "latest": self._on_latest,
+            "formats": self._on_formats,
+            "setformat": self._on_setformat,
+            "myinfo": self._on_myinfo,
+            "mute": self._on_mute,
+            "unmute": self._on_unmute,
+        }
+
     # ── DB setup ──────────────────────────────────────────────────────
 
     def _init_tables(self):
@@ -111,6 +163,7 @@ class InteractiveBot:
                 )
                 """
             )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_bot_users_muted ON bot_users(muted)")
 
     def _register_user(self, user_id: str, chat_id: str, username: Optional[str] = None) -> bool:
         """Register a user. Returns True if newly registered, False if already existed."""
@@ -140,9 +193,20 @@ class InteractiveBot:
     def _get_user_count(self) -> dict:
         """Get user stats."""
         with self.db.connect() as conn:
-            total = conn.execute("SELECT COUNT(*) AS c FROM bot_users").fetchone()["c"]
-            active = conn.execute("SELECT COUNT(*) AS c FROM bot_users WHERE muted = 0").fetchone()["c"]
-            return {"total": total, "active": active, "muted": total - active}
+            row = conn.execute(
+                "SELECT COUNT(*) AS total, COALESCE(SUM(muted = 0), 0) AS active FROM bot_users"
+            ).fetchone()
+            return {"total": row["total"], "active": row["active"], "muted": row["total"] - row["active"]}
+
+    def _mark_delivered(self, user_ids: List[str], ts: float):
+        """Stamp last_delivered_at for every successfully served user in one statement."""
+        if not user_ids:
+            return
+        with self.db.connect() as conn:
+            conn.executemany(
+                "UPDATE bot_users SET last_delivered_at = ? WHERE user_id = ?",
+                [(ts, uid) for uid in user_ids],
+            )
 
     def _get_user_pref(self, user_id: str) -> str:
         """Get user's preferred default format."""
@@ -192,7 +256,7 @@ class InteractiveBot:
                 f"to {len(users)} user(s)..."
             )
 
-            delivered = 0
+            delivered_ids = []
             failed = 0
             now = time.time()
 
@@ -209,19 +273,13 @@ class InteractiveBot:
                     for fpath, caption in files_to_send:
                         await self.client.send_file(chat_id, fpath, caption=caption, parse_mode="md")
                         await asyncio.sleep(0.3)
-
-                    # Update last_delivered_at
-                    with self.db.connect() as conn:
-                        conn.execute(
-                            "UPDATE bot_users SET last_delivered_at = ? WHERE user_id = ?",
-                            (now, user["user_id"]),
-                        )
-                    delivered += 1
+                    delivered_ids.append(user["user_id"])
                 except Exception as e:
                     logger.warning(f"[GatherX] Failed to deliver to {user['user_id']}: {e}")
                     failed += 1
 
-            logger.info(f"[GatherX] Delivery complete: {delivered} ok, {failed} failed.")
+            self._mark_delivered(delivered_ids, now)
+            logger.info(f"[GatherX] Delivery complete: {len(delivered_ids)} ok, {failed} failed.")
         except Exception as e:
             logger.error(f"[GatherX] Delivery error: {e}")
         finally:
@@ -232,19 +290,42 @@ class InteractiveBot:
             # Allow Telethon internal tasks to finish cancellation
             await asyncio.sleep(0.25)
 
+    async def _register_commands(self):
+        """Register the command menu with Telegram unless it is already current."""
+        digest = _bot_commands_digest(self.token)
+        try:
+            if self._commands_hash_path.read_text(encoding="utf-8").strip() == digest:
+                logger.info("[GatherX] Bot commands menu unchanged, skipping registration.")
+                return
+        except OSError:
+            pass
+
+        try:
+            await self.client(SetBotCommandsRequest(
+                scope=BotCommandScopeDefault(),
+                lang_code="",
+                commands=_BOT_COMMANDS,
+            ))
+            logger.info("[GatherX] Bot commands menu registered.")
+        except Exception as e:
+            logger.warning(f"[GatherX] Failed to register commands: {e}")
+            return
+
+        try:
+            self._commands_hash_path.write_text(digest, encoding="utf-8")
+        except OSError as e:
+            logger.debug(f"[GatherX] Could not store commands hash: {e}")
+
     def _register_handlers(self):
-        """Register all event handlers and the callback query handler."""
-        self.client.add_event_handler(self._on_start, events.NewMessage(pattern=r"(?i)/start"))
-        self.client.add_event_handler(self._on_help, events.NewMessage(pattern=r"(?i)/help"))
-        self.client.add_event_handler(self._on_get, events.NewMessage(pattern=r"(?i)/get"))
-        self.client.add_event_handler(self._on_latest, events.NewMessage(pattern=r"(?i)/latest"))
-        self.client.add_event_handler(self._on_formats, events.NewMessage(pattern=r"(?i)/formats"))
-        self.client.add_event_handler(self._on_setformat, events.NewMessage(pattern=r"(?i)/setformat"))
-        self.client.add_event_handler(self._on_myinfo, events.NewMessage(pattern=r"(?i)/myinfo"))
-        self.client.add_event_handler(self._on_mute, events.NewMessage(pattern=r"(?i)/mute"))
-        self.client.add_event_handler(self._on_unmute, events.NewMessage(pattern=r"(?i)/unmute"))
+        """Register the command dispatcher and the callback query handler."""
+        self.client.add_event_handler(self._on_command, events.NewMessage(pattern=_COMMAND_RE))
         self.client.add_event_handler(self._on_callback, events.CallbackQuery())
 
+    async def _on_command(self, event):
+        """Route a slash command to its handler via the dispatch table."""
+        cmd = event.pattern_match.group(1).lower()
+        await self._dispatch[cmd](event)
+
     async def start(self):
         """Start the bot in persistent interactive mode (long-polling).
 
@@ -255,16 +336,7 @@ class InteractiveBot:
         """
         await self.client.start(bot_token=self.token)
 
-        # Register command menu with Telegram
-        try:
-            await self.client(SetBotCommandsRequest(
-                scope=BotCommandScopeDefault(),
-                lang_code="",
-                commands=_BOT_COMMANDS,
-            ))
-            logger.info("[GatherX] Bot commands menu registered.")
-        except Exception as e:
-            logger.warning(f"[GatherX] Failed to register commands: {e}")
+        await self._register_commands()
 
         self._register_handlers()
 
@@ -315,7 +387,10 @@ class InteractiveBot:
             return results
 
         for f in sorted(output_dir.iterdir()):
-            if not f.is_file() or f.stat().st_size == 0:
+            if not f.is_file():
+                continue
+            size = f.stat().st_size
+            if size == 0:
                 continue
             name = f.name
 
@@ -323,7 +398,7 @@ class InteractiveBot:
             if not any(self._filename_matches_format(name, fmt) for fmt in allowed):
                 continue
 
-            size_kb = f.stat().st_size / 1024
+            size_kb = size / 1024
 
             # Determine a nice caption
             if name.endswith(".npvt"):
@@ -348,10 +423,14 @@ class InteractiveBot:
             await self.client.send_message(chat_id, f"No artifacts in the last {days} day(s).")
             return 0
 
+        # Filter once up front; names are matched on the full ".{fmt}" tail
+        # because multi-dot formats like "decoded.json" have no single suffix.
+        if fmt:
+            tail = f".{fmt}"
+            files = [f for f in files if f.name.endswith(tail)]
+
         sent = 0
         for f in files:
-            if fmt and not f.name.endswith(f".{fmt}"):
-                continue
             size_kb = f.stat().st_size / 1024
             await self.client.send_file(
                 chat_id, f,
@@ -492,27 +571,12 @@ class InteractiveBot:
     async def _on_formats(self, event):
         self._register_user(str(event.sender_id), str(event.chat_id))
 
-        text_fmts = ["npvt", "npvtsub", "conf_lines", "b64sub", "decoded.json"]
-        bin_fmts = ["ovpn", "npv4", "ehi", "hc", "hat", "sip", "nm", "dark"]
-
-        lines = ["📋 **Available Formats**\n"]
-        lines.append("**Text-based** (proxy URIs):")
-        for f in text_fmts:
-            label = _FORMAT_LABELS.get(f, f)
-            lines.append(f"  `{f}` — {label}")
-        lines.append("")
-        lines.append("**Binary configs** (ZIP archives):")
-        for f in bin_fmts:
-            label = _FORMAT_LABELS.get(f, f)
-            lines.append(f"  `{f}` — {label}")
-        lines.append("\nUse `/get <format>` to download.")
-
         buttons = [
             [Button.inline("📋 Get npvt", b"get:npvt"),
              Button.inline("🔗 Get b64sub", b"get:b64sub")],
             [Button.inline("📊 Get decoded.json", b"get:decoded.json")],
         ]
-        await event.respond("\n".join(lines), parse_mode="md", buttons=buttons)
+        await event.respond(_FORMATS_TEXT, parse_mode="md", buttons=buttons)
 
     async def _on_setformat(self, event):
         """Set user's preferred default format: /setformat <fmt>"""
@@ -683,17 +747,8 @@ class InteractiveBot:
 
     async def _respond_formats(self, chat_id: int):
         """Send formats list to a chat."""
-        text_fmts = ["npvt", "npvtsub", "conf_lines", "b64sub", "decoded.json"]
-        bin_fmts = ["ovpn", "npv4", "ehi", "hc", "hat", "sip", "nm", "dark"]
-        lines = ["📋 **Available Formats**\n", "**Text-based:**"]
-        for f in text_fmts:
-            lines.append(f"  `{f}` — {_FORMAT_LABELS.get(f, f)}")
-        lines.append("\n**Binary (ZIP):**")
-        for f in bin_fmts:
-            lines.append(f"  `{f}` — {_FORMAT_LABELS.get(f, f)}")
-        lines.append("\nUse `/get <format>` to download.")
         buttons = [[Button.inline("📋 Get npvt", b"get:npvt"), Button.inline("🔗 Get b64sub", b"get:b64sub")]]
-        await self.client.send_message(chat_id, "\n".join(lines), parse_mode="md", buttons=buttons)
+        await self.client.send_message(chat_id, _FORMATS_TEXT, parse_mode="md", buttons=buttons)
 
     async def _respond_myinfo(self, chat_id: int, user_id: str):
         """Send user settings to a chat (callback version)."""
@@ -31,6 +31,8 @@ def main():
                             help="Text message lookback hours on subsequent runs (0=all new, default: 0)")
     run_parser.add_argument("--file-subsequent-hours", type=float, default=0,
                             help="File/media lookback hours on subsequent runs (0=all new, default: 0)")
+    run_parser.add_argument("--poll-timeout", type=int, default=0,
+                            help="Bot API getUpdates long-poll seconds per token (0=return at once, default: 0)")
     run_parser.add_argument("--no-deliver", action="store_true",
                             help="Skip automatic subscription delivery after pipeline")
 
@@ -90,6 +92,7 @@ def _cmd_run(args):
         "file_fresh_hours": args.file_fresh_hours,
         "msg_subsequent_hours": args.msg_subsequent_hours,
         "file_subsequent_hours": args.file_subsequent_hours,
+        "poll_timeout": args.poll_timeout,
     }
 
     try:
@@ -151,17 +154,39 @@ def _cmd_clean(args):
             print("Aborted.")
             return
 
-    for p in existing:
-        if p.is_dir():
-            shutil.rmtree(p)
-            logger.info(f"Removed directory: {p}")
-        elif p.is_file():
-            p.unlink()
-            logger.info(f"Removed file: {p}")
+    for p, err in _remove_paths(existing):
+        if err is not None:
+            raise err
+        logger.info(f"Removed: {p}")
 
     print("Cleanup complete.")
 
 
+def _remove_path(p: Path):
+    if p.is_dir():
+        shutil.rmtree(p)
+    elif p.is_file():
+        p.unlink()
+
+
+def _remove_paths(items):
+    """Delete files/directories concurrently on worker threads.
+    Returns a list of (path, exception-or-None) in input order."""
+    import concurrent.futures
+
+    def _attempt(p: Path):
+        try:
+            _remove_path(p)
+        except Exception as e:
+            return e
+        return None
+
+    if not items:
+        return []
+    with concurrent.futures.ThreadPoolExecutor(max_workers=min(8, len(items))) as ex:
+        return list(zip(items, ex.map(_attempt, items)))
+
+
 def _cmd_reset(args):
     """Full factory reset: wipe ALL data, state, caches, outputs, and source offsets.
     This returns every source to first-seen state."""
@@ -199,16 +224,12 @@ def _cmd_reset(args):
             return
 
     removed = 0
-    for p in existing:
-        try:
-            if p.is_dir():
-                shutil.rmtree(p)
-            elif p.is_file():
-                p.unlink()
+    for p, err in _remove_paths(existing):
+        if err is None:
             removed += 1
             logger.info(f"[Reset] Removed: {p}")
-        except Exception as e:
-            logger.error(f"[Reset] Failed to remove {p}: {e}")
+        else:
+            logger.error(f"[Reset] Failed to remove {p}: {err}")
 
     # Recreate outputs dirs with READMEs so git tracks them
     outputs_dir = repo_root / "outputs"
@@ -231,9 +252,6 @@ def _cmd_reset(args):
 
 def _deliver_updates():
     """Auto-deliver subscription updates to all subscribers after pipeline."""
-    import asyncio
-    from ..bot.interactive import InteractiveBot
-
     token = os.environ.get("PUBLISH_BOT_TOKEN") or os.environ.get("TELEGRAM_TOKEN")
     api_id = int(os.environ.get("TELEGRAM_API_ID", "0"))
     api_hash = os.environ.get("TELEGRAM_API_HASH", "")
@@ -242,6 +260,10 @@ def _deliver_updates():
         logger.warning("Bot credentials not configured — skipping subscription delivery.")
         return
 
+    # Deferred until credentials are known so runs without a bot skip Telethon
+    import asyncio
+    from ..bot.interactive import InteractiveBot
+
     logger.info("Delivering subscription updates via HuntX bot...")
     bot = InteractiveBot(token, api_id, api_hash)
 
@@ -1,20 +1,59 @@
 import os
 import re
-from typing import Any
+from functools import lru_cache
+from typing import Any, Optional
+
+
+# ${VAR} or ${VAR:-default}; compiled once at import
+_ENV_RE = re.compile(r"\$\{([A-Za-z0-9_]+)(?::-([^}]*))?\}")
+
+
+@lru_cache(maxsize=256)
+def _lookup(name: str) -> Optional[str]:
+    return os.environ.get(name)
+
+
+def _resolve(m: "re.Match[str]") -> str:
+    value = _lookup(m.group(1))
+    return value if value is not None else (m.group(2) or "")
+
+
+def _expand_text(text: str) -> str:
+    return _ENV_RE.sub(_resolve, text)
 
 
 def expand_env(text: str) -> str:
-    # Use raw string for regex
-    pattern = re.compile(r"\$\{([A-Za-z0-9_]+)\}")
-    return pattern.sub(lambda m: os.getenv(m.group(1), ""), text)
+    _lookup.cache_clear()
+    return _expand_text(text)
 
 
-def recursive_expand(data: Any) -> Any:
+def _has_env(data: Any) -> bool:
+    if isinstance(data, str):
+        return "${" in data
+    if isinstance(data, dict):
+        return any(_has_env(v) for v in data.values())
+    if isinstance(data, list):
+        return any(_has_env(item) for item in data)
+    return False
+
+
+def _expand(data: Any) -> Any:
+    # Env-free subtrees are returned as-is; only branches with ${...} are rebuilt.
+    if not _has_env(data):
+        return data
     if isinstance(data, dict):
-        return {k: recursive_expand(v) for k, v in data.items()}
+        return {k: _expand(v) for k, v in data.items()}
     elif isinstance(data, list):
-        return [recursive_expand(item) for item in data]
+        return [_expand(item) for item in data]
     elif isinstance(data, str):
-        return expand_env(data)
+        return _expand_text(data)
     else:
         return data
+
+
+def recursive_expand(data: Any) -> Any:
+    # Lookups are memoized for the duration of one expansion, so repeated
+    # references (e.g. one token shared by many sources) hit os.environ once,
+    # while a later call still sees any environment changes made in between.
+    _lookup.cache_clear()
+    return _expand(data)
@@ -1,9 +1,18 @@
 import yaml
 import logging
+from functools import lru_cache
 from pathlib import Path
+from typing import Any
 from .schema import AppConfig
 from .env_expand import recursive_expand
 
+# Prefer libyaml's C loader; fall back to the pure-Python one when PyYAML
+# was built without it.
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # pragma: no cover - depends on the PyYAML build
+    from yaml import SafeLoader as _YamlLoader
+
 logger = logging.getLogger(__name__)
 
 
@@ -12,14 +21,15 @@ def load_config(path: "str | Path") -> AppConfig:
     if not p.exists():
         raise FileNotFoundError(f"Config file not found: {path}")
 
-    with open(p, "r") as f:
-        data = yaml.safe_load(f)
+    # Only the YAML parse is cached, keyed on mtime so an edited file is
+    # re-parsed. Env expansion and validation run on every call so a changed
+    # environment (tokens, secrets) is always picked up.
+    data = _parse_yaml_cached(str(p.resolve()), p.stat().st_mtime_ns)
 
-    # Expand environment variables
+    # Expand environment variables (builds new containers, never mutates
+    # the cached parse)
     data = recursive_expand(data)
 
-    # Use Pydantic model_validate (v2) or parse_obj (v1)
-    # We installed Pydantic v2
     try:
         config = AppConfig.model_validate(data)
         logger.info(f"Loaded config with {len(config.sources)} sources and {len(config.routes)} routes.")
@@ -27,3 +37,10 @@ def load_config(path: "str | Path") -> AppConfig:
     except Exception as e:
         logger.error(f"Configuration validation failed: {e}")
         raise
+
+
+@lru_cache(maxsize=4)
+def _parse_yaml_cached(path: str, mtime_ns: int) -> Any:
+    # Bytes let libyaml detect the encoding and decode in C
+    with open(path, "rb") as f:
+        return yaml.load(f, Loader=_YamlLoader)
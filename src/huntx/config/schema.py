@@ -1,12 +1,18 @@
-from typing import List, Optional
-from pydantic import BaseModel, field_validator
+from typing import ClassVar, FrozenSet, List, Optional
+from pydantic import BaseModel, ConfigDict, field_validator
 
 
-class TelegramSourceConfig(BaseModel):
+class _ConfigModel(BaseModel):
+    # One AppConfig is read by every orchestrator worker thread, so the models
+    # are immutable to keep one worker from changing config under the others.
+    model_config = ConfigDict(frozen=True)
+
+
+class TelegramSourceConfig(_ConfigModel):
     token: str
     chat_id: str
 
-    @field_validator("token")
+    @field_validator("token", mode="after")
     @classmethod
     def validate_token(cls, v: str) -> str:
         if ":" not in v:
@@ -14,51 +20,53 @@ class TelegramSourceConfig(BaseModel):
         return v
 
 
-class TelegramUserSourceConfig(BaseModel):
+class TelegramUserSourceConfig(_ConfigModel):
     api_id: int
     api_hash: str
     session: str
     peer: str
 
 
-class SourceSelector(BaseModel):
+class SourceSelector(_ConfigModel):
     include_formats: List[str]
 
 
-class SourceConfig(BaseModel):
+class SourceConfig(_ConfigModel):
     id: str
     type: str
     selector: Optional[SourceSelector] = None
     telegram: Optional[TelegramSourceConfig] = None
     telegram_user: Optional[TelegramUserSourceConfig] = None
 
-    @field_validator("type")
+    _ALLOWED_TYPES: ClassVar[FrozenSet[str]] = frozenset({"telegram", "telegram_user"})
+
+    @field_validator("type", mode="after")
     @classmethod
     def validate_type(cls, v: str) -> str:
-        if v not in ("telegram", "telegram_user"):
+        if v not in cls._ALLOWED_TYPES:
             raise ValueError(f"Unknown source type: {v}")
         return v
 
 
-class DestinationConfig(BaseModel):
+class DestinationConfig(_ConfigModel):
     chat_id: str
     mode: str = "telegram"
     caption_template: str = "{filename}"
     token: Optional[str] = None
 
 
-class PublishRoute(BaseModel):
+class PublishRoute(_ConfigModel):
     name: str
     from_sources: List[str]
     formats: List[str]
     destinations: List[DestinationConfig]
 
 
-class PublishingConfig(BaseModel):
+class PublishingConfig(_ConfigModel):
     routes: List[PublishRoute]
 
 
-class AppConfig(BaseModel):
+class AppConfig(_ConfigModel):
     sources: List[SourceConfig]
     # 'routes' are nested under 'publishing' key in YAML
     publishing: PublishingConfig
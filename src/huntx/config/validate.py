@@ -1,15 +1,17 @@
+from collections import Counter
+
 from .schema import AppConfig
 
 
 def validate_config(config: AppConfig):
     # Basic validation
-    seen_ids = set()
-    for s in config.sources:
-        if s.id in seen_ids:
-            raise ValueError(f"Duplicate source ID: {s.id}")
-        seen_ids.add(s.id)
+    ids = [s.id for s in config.sources]
+    seen_ids = set(ids)
+    if len(seen_ids) != len(ids):
+        dup = next(i for i, count in Counter(ids).items() if count > 1)
+        raise ValueError(f"Duplicate source ID: {dup}")
 
     for r in config.routes:
-        for src_ref in r.from_sources:
-            if src_ref not in seen_ids:
-                raise ValueError(f"Route {r.name} references unknown source {src_ref}")
+        if not seen_ids.issuperset(r.from_sources):
+            src_ref = next(ref for ref in r.from_sources if ref not in seen_ids)
+            raise ValueError(f"Route {r.name} references unknown source {src_ref}")
@@ -1,11 +1,22 @@
+import bisect
+import concurrent.futures
+import http.client
+import io
+import itertools
 import logging
+import random
+import re
 import time
+import urllib.parse
 import urllib.request
 import urllib.error
-import json
+import threading
+from collections import OrderedDict, deque
 from dataclasses import dataclass
-from typing import Dict, Any, Optional, Iterator
+from operator import itemgetter
+from typing import Dict, Any, Optional, Iterator, Tuple
 from ..base import SourceConnector, SourceItem
+from ...utils.jsonfast import dumps_bytes, loads as json_loads
 
 
 @dataclass
@@ -19,43 +30,200 @@ class TelegramItem:
 
 logger = logging.getLogger(__name__)
 
+# Bot API tokens are "<bot id>:<35-char secret>"
+_TOKEN_RE = re.compile(r"^\d+:[A-Za-z0-9_-]{30,}$")
+
 # Constants for retries
 MAX_RETRIES = 6
 BACKOFF_FACTOR = 1
+MAX_BACKOFF = 60
+
+# getFile refuses files above 20 MB, so larger documents are skipped before
+# any request is made (the refusal would otherwise be retried with backoff).
+_MAX_DOWNLOAD_BYTES = 20 * 1024 * 1024
+
+# Soft bound on updates kept in the per-token cache shared by connectors. Only
+# updates every source on the bot has consumed are evicted: getUpdates has
+# already acknowledged them, so the cache holds the only copy.
+_MAX_CACHED_UPDATES = 10000
+
+# getFile links stay valid for at least an hour; reuse them for re-fetches
+_FILE_PATH_TTL = 3600
+_MAX_CACHED_FILE_PATHS = 1024
+
+# Documents fetched (getFile + download) concurrently ahead of the consumer
+_DOWNLOAD_WORKERS = 4
+
+# Document MIME types that never carry configs; skipped before getFile
+_SKIPPED_MIME_PREFIXES = ("video/", "audio/", "image/")
+_SKIPPED_MIME_TYPES = frozenset((
+    "application/vnd.android.package-archive",
+    "application/x-iso9660-image",
+))
+
+# getUpdates timeout in seconds (fetch_windows "poll_timeout"). A run drains
+# the queue and exits, so the default returns at once when nothing is pending;
+# a longer value long-polls, holding each idle token open for that long.
+_DEFAULT_POLL_TIMEOUT = 0
+_POLL_LIMIT = 100
+
+# Sources on the same bot that poll within this window of each other reuse
+# the drained cache instead of long-polling an empty queue again
+_POLL_REUSE_S = 60
+
+# Media types to drop entirely (not useful for proxy configs)
+_UNWANTED_MEDIA_FIELDS = frozenset(("photo", "video", "animation", "sticker", "voice", "audio", "video_note"))
+
+
+class _BotApiSession:
+    """
+    Keeps one HTTPS connection to api.telegram.org open across calls so the
+    getUpdates loop, getFile and downloads skip a TCP+TLS handshake each.
+    Mirrors urlopen's contract: returns a response usable as a context
+    manager and raises urllib.error.HTTPError / URLError on failure.
+    Falls back to urlopen when an HTTPS proxy is configured.
+    Not thread-safe; each connector owns its own session.
+    """
+
+    def __init__(self):
+        self._conn: Optional[http.client.HTTPSConnection] = None
+        self._host: Optional[str] = None
+
+    def open(self, req: urllib.request.Request, timeout: float):
+        parts = urllib.parse.urlsplit(req.full_url)
+        if urllib.request.getproxies().get("https") and not urllib.request.proxy_bypass(parts.hostname):
+            return urllib.request.urlopen(req, timeout=timeout)
+
+        path = parts.path + (f"?{parts.query}" if parts.query else "")
+        headers = dict(req.header_items())
+        # A reused connection may have been closed by the server while idle;
+        # that shows up on first use, so retry once on a fresh connection.
+        for attempt in range(2):
+            reused = self._conn is not None and self._host == parts.netloc
+            if not reused:
+                self.close()
+                self._conn = http.client.HTTPSConnection(parts.netloc, timeout=timeout)
+                self._host = parts.netloc
+            elif self._conn.sock is not None:
+                self._conn.sock.settimeout(timeout)
+            self._conn.timeout = timeout
+            try:
+                self._conn.request(req.get_method(), path, body=req.data, headers=headers)
+                response = self._conn.getresponse()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError) as e:
+                self.close()
+                if reused and attempt == 0:
+                    continue
+                raise urllib.error.URLError(e)
+            except (OSError, http.client.HTTPException) as e:
+                self.close()
+                raise urllib.error.URLError(e)
+
+            if response.status >= 400:
+                body = response.read()
+                raise urllib.error.HTTPError(req.full_url, response.status, response.reason,
+                                             response.headers, io.BytesIO(body))
+            return response
+        raise urllib.error.URLError("connection closed")
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+            self._host = None
+
+
+def _retry_delay(attempt: int, error: Optional[BaseException] = None) -> float:
+    """Seconds to wait before retrying after a failed attempt.
+
+    A 429 honours Telegram's requested delay (Retry-After header, or
+    parameters.retry_after in the error body); anything else backs off
+    exponentially, capped at MAX_BACKOFF, with jitter so bots sharing an
+    outage do not retry in lockstep.
+    """
+    if isinstance(error, urllib.error.HTTPError) and error.code == 429:
+        retry_after = error.headers.get("Retry-After") if error.headers else None
+        if retry_after is None:
+            try:
+                retry_after = json_loads(error.read()).get("parameters", {}).get("retry_after")
+            except Exception:
+                retry_after = None
+        try:
+            if retry_after is not None:
+                return min(MAX_BACKOFF, max(0.0, float(retry_after)))
+        except (TypeError, ValueError):
+            pass
+    return min(MAX_BACKOFF, BACKOFF_FACTOR * (1 << attempt) * random.uniform(0.5, 1.5))
+
+
+class _SharedState:
+    """Per-token update cache shared by every connector polling that bot."""
+
+    __slots__ = ("updates", "last_offset", "consumed", "lock", "polled_at")
+
+    def __init__(self):
+        self.updates: Dict[int, Dict[str, Any]] = {}
+        self.last_offset = 0
+        # Highest update id each source (by chat) has consumed from the cache
+        self.consumed: Dict[str, int] = {}
+        # Held while polling and while snapshotting updates
+        self.lock = threading.Lock()
+        self.polled_at = float("-inf")
 
 
 class TelegramConnector(SourceConnector):
     # Shared state to coordinate updates across multiple instances with the same token
-    # Structure: { token: { 'updates': {update_id: update_obj}, 'last_offset': int } }
-    _shared_state: Dict[str, Any] = {}
+    _shared_state: Dict[str, _SharedState] = {}
+    _shared_state_lock = threading.Lock()
+    # (token, file_id) -> (file_path, resolved_at), oldest first; shared by download threads
+    _file_paths: "OrderedDict[Tuple[str, str], Tuple[str, float]]" = OrderedDict()
+    _file_paths_lock = threading.Lock()
 
     def __init__(self, token: str, chat_id: str, state: Optional[Dict[str, Any]] = None,
                  fetch_windows: Optional[Dict[str, Any]] = None):
         self.token = token
         self.target_chat_id = str(chat_id)
+        # Bot API reports chat ids as JSON numbers; compare ints in the hot loop
+        try:
+            self._target_chat_int: Optional[int] = int(self.target_chat_id)
+        except ValueError:
+            self._target_chat_int = None
         # If state is None or offset is 0, it is effectively a fresh start.
         self.offset = state.get("offset", 0) if state else 0
         self.base_url = f"https://api.telegram.org/bot{self.token}"
+        # One keep-alive session per thread: the main thread polls getUpdates,
+        # download-pool threads fetch documents.
+        self._local = threading.local()
+        self._sessions = []
         fw = fetch_windows or {}
         self._msg_fresh_s = fw.get("msg_fresh_hours", 2) * 3600
         self._file_fresh_s = fw.get("file_fresh_hours", 48) * 3600
         self._msg_sub_s = fw.get("msg_subsequent_hours", 0) * 3600
         self._file_sub_s = fw.get("file_subsequent_hours", 0) * 3600
+        self._poll_timeout = int(fw.get("poll_timeout", _DEFAULT_POLL_TIMEOUT))
 
         # Basic validation for Bot Token format
-        if ":" in self.token:
-            prefix = self.token.split(":")[0]
-            if not prefix.isdigit():
-                logger.warning(
-                    f"The provided token starts with '{prefix}', which is not a digit. "
-                    f"Ensure this is a valid Telegram Bot API token (e.g., '123456:ABC-DEF...'), "
-                    f"and NOT a Telethon session string."
-                )
-        else:
+        if not _TOKEN_RE.match(self.token):
             logger.warning(
-                "The provided token does not contain a colon. Ensure this is a valid Telegram Bot API token."
+                "The provided token does not look like a Telegram Bot API token. "
+                "Ensure this is a valid bot token (e.g., '123456:ABC-DEF...'), "
+                "and NOT a Telethon session string."
             )
 
+    @property
+    def _session(self) -> _BotApiSession:
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = _BotApiSession()
+            self._sessions.append(session)
+        return session
+
+    def _close_sessions(self):
+        for session in self._sessions:
+            session.close()
+        self._sessions = []
+        self._local = threading.local()
+
     def _make_request(self, method: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         url = f"{self.base_url}/{method}"
         start_time = time.time()
@@ -63,26 +231,29 @@ class TelegramConnector(SourceConnector):
         params = params or {}
 
         if params:
-            data = json.dumps(params).encode("utf-8")
+            data = dumps_bytes(params)
             req = urllib.request.Request(url, data=data, headers={"Content-Type": "application/json"})
         else:
             req = urllib.request.Request(url)
 
+        # A long-polling getUpdates is held open server-side for params["timeout"]
+        timeout = max(60, params.get("timeout", 0) + 10) if method == "getUpdates" else 30
+
         for attempt in range(MAX_RETRIES + 1):
             try:
-                with urllib.request.urlopen(req, timeout=30) as response:
-                    res = json.loads(response.read().decode("utf-8"))
+                with self._session.open(req, timeout=timeout) as response:
+                    res = json_loads(response.read())
                     duration = time.time() - start_time
                     # Only log slow requests or if debug
                     if duration > 1.0:
-                        logger.debug(f"API request {method} took {duration:.2f}s")
+                        logger.debug("API request %s took %.2fs", method, duration)
                     return res
             except urllib.error.URLError as e:
                 if attempt < MAX_RETRIES:
-                    sleep_time = BACKOFF_FACTOR * (2**attempt)
+                    sleep_time = _retry_delay(attempt, e)
                     logger.warning(
                         f"Telegram API error (attempt {attempt + 1}/{MAX_RETRIES + 1}): {e}. "
-                        f"Retrying in {sleep_time}s..."
+                        f"Retrying in {sleep_time:.1f}s..."
                     )
                     time.sleep(sleep_time)
                 else:
@@ -92,21 +263,22 @@ class TelegramConnector(SourceConnector):
 
     def _download_file(self, file_path: str) -> Optional[bytes]:
         url = f"https://api.telegram.org/file/bot{self.token}/{file_path}"
-        logger.debug(f"Downloading file from {url}")
+        logger.debug("Downloading file from %s", url)
 
         for attempt in range(MAX_RETRIES + 1):
             try:
                 start_time = time.time()
-                with urllib.request.urlopen(url, timeout=60) as response:
+                with self._session.open(urllib.request.Request(url), timeout=60) as response:
                     data = response.read()
                     duration = time.time() - start_time
-                    logger.debug(f"Downloaded {len(data)} bytes in {duration:.2f}s")
+                    logger.debug("Downloaded %d bytes in %.2fs", len(data), duration)
                     return data
             except Exception as e:
                 if attempt < MAX_RETRIES:
-                    sleep_time = BACKOFF_FACTOR * (2**attempt)
+                    sleep_time = _retry_delay(attempt, e)
                     logger.warning(
-                        f"Download failed (attempt {attempt + 1}/{MAX_RETRIES + 1}): {e}. Retrying in {sleep_time}s..."
+                        f"Download failed (attempt {attempt + 1}/{MAX_RETRIES + 1}): {e}. "
+                        f"Retrying in {sleep_time:.1f}s..."
                     )
                     time.sleep(sleep_time)
                 else:
@@ -136,111 +308,83 @@ class TelegramConnector(SourceConnector):
             cutoff_time_text = now - self._msg_sub_s if self._msg_sub_s > 0 else 0
 
         # Initialize shared state for this token if needed
-        if self.token not in self._shared_state:
-            self._shared_state[self.token] = {"updates": {}, "last_offset": 0}
-
-        shared = self._shared_state[self.token]
-
-        # Fetch new updates from Telegram into shared cache
-        has_more = True
-
-        current_max_update_id = shared["last_offset"]
-        fetched_updates_count = 0
-
-        while has_more:
-            # We request updates starting from the last known biggest update_id + 1
-            # Note: Telegram getUpdates offset is "identifier of the first update to be returned".
-
-            req_offset = current_max_update_id + 1 if current_max_update_id > 0 else 0
-
-            resp = self._make_request(
-                "getUpdates",
-                {"offset": req_offset, "timeout": 2, "limit": 100, "allowed_updates": ["channel_post", "message"]},
+        with self._shared_state_lock:
+            shared = self._shared_state.get(self.token)
+            if shared is None:
+                shared = self._shared_state[self.token] = _SharedState()
+
+        # One source per bot polls at a time (Telegram answers overlapping
+        # getUpdates with 409 Conflict); a source that waited on the lock
+        # reuses the backlog the previous one just drained.
+        with shared.lock:
+            # Pin the cache at this source's offset until it has processed it
+            chat_key = self.target_chat_id
+            shared.consumed[chat_key] = min(shared.consumed.get(chat_key, local_offset), local_offset)
+            polled = time.monotonic() - shared.polled_at >= _POLL_REUSE_S
+            if polled:
+                fetched_updates_count = self._poll_updates(shared)
+                shared.polled_at = time.monotonic()
+            else:
+                fetched_updates_count = 0
+            # getUpdates returns ascending ids and only newer ids are appended, so
+            # the cache is already in order; snapshot it instead of sorting.
+            cached_updates = list(shared.updates.items())
+
+        cache_size = len(cached_updates)
+        if polled:
+            logger.info(
+                f"[BotAPI] Fetched {fetched_updates_count} new updates  "
+                f"cache_total={cache_size}  processing..."
             )
+        else:
+            logger.info(f"[BotAPI] Reusing updates just polled for this bot  cache_total={cache_size}  processing...")
 
-            if not resp.get("ok"):
-                logger.warning(f"getUpdates returned not OK: {resp}")
-                break
-
-            updates = resp.get("result", [])
-            fetched_updates_count += len(updates)
-
-            if not updates:
-                has_more = False
-                break
-
-            for update in updates:
-                update_id = update["update_id"]
-                current_max_update_id = max(current_max_update_id, update_id)
-
-                # Cache the update if not present
-                if update_id not in shared["updates"]:
-                    shared["updates"][update_id] = update
-
-            shared["last_offset"] = current_max_update_id
-
-            # small sleep to be nice to API
-            time.sleep(0.5)
-
-        cache_size = len(shared["updates"])
-        logger.info(
-            f"[BotAPI] Fetched {fetched_updates_count} new updates  "
-            f"cache_total={cache_size}  processing..."
-        )
-
-        if fetched_updates_count == 0 and is_fresh_start:
+        if polled and fetched_updates_count == 0 and is_fresh_start:
             logger.warning(
                 "[BotAPI] Zero updates on fresh start. Bot API only receives messages sent AFTER "
                 "the bot was started. Use 'telegram_user' source type for history."
             )
 
-        # Now yield items from cache relevant to THIS source
-        sorted_ids = sorted(shared["updates"].keys())
-
-        # Statistics counters
-        # Media types to drop entirely (not useful for proxy configs)
-        _UNWANTED_MEDIA_FIELDS = ("photo", "video", "animation", "sticker", "voice", "audio", "video_note")
-
-        stats = {
-            "skipped_chat_mismatch": 0,
-            "skipped_old_timestamp": 0,
-            "skipped_no_content": 0,
-            "skipped_size_limit": 0,
-            "skipped_apk": 0,
-            "skipped_media_type": 0,
-            "processed_updates": 0,
-            "yielded_items": 0,
-        }
-
-        for update_id in sorted_ids:
-            if update_id <= local_offset:
-                continue
+        # Now yield items from cache relevant to THIS source, binary-searching
+        # past the ids it has already consumed.
+        first_new = bisect.bisect_right(cached_updates, local_offset, key=itemgetter(0))
 
-            stats["processed_updates"] += 1
+        # Statistics counters (plain locals: they are bumped once per update)
+        processed_updates = len(cached_updates) - first_new
+        skipped_chat_mismatch = skipped_old_timestamp = skipped_no_content = 0
+        skipped_size_limit = skipped_apk = skipped_media_type = yielded_items = 0
 
-            # Update local offset tracking
-            self.offset = max(self.offset, update_id)
+        # Pass 1: filter updates without touching the network. Each kept entry is
+        # (update_id, msg, text_content, doc); doc is None unless it must be fetched.
+        entries = []
+        last_update_id = local_offset
+        target_chat = self._target_chat_int
+        for update_id, update in itertools.islice(cached_updates, first_new, None):
+            last_update_id = update_id
 
-            update = shared["updates"][update_id]
             msg = update.get("channel_post") or update.get("message")
             if not msg:
-                logger.debug(f"Update {update_id} has no message/channel_post")
+                logger.debug("Update %s has no message/channel_post", update_id)
                 continue
 
-            # Check chat_id
-            msg_chat_id = str(msg.get("chat", {}).get("id"))
-            if msg_chat_id != self.target_chat_id:
+            # Check chat_id; Bot API messages always carry chat.id, so
+            # subscript directly and treat a malformed update as a mismatch.
+            try:
+                msg_chat_id = msg["chat"]["id"]
+            except (KeyError, TypeError):
+                msg_chat_id = None
+            if msg_chat_id is None or msg_chat_id != target_chat:
                 # logger.debug(f"Update {update_id} skipped: Chat ID {msg_chat_id} != target {self.target_chat_id}")
-                stats["skipped_chat_mismatch"] += 1
+                skipped_chat_mismatch += 1
                 continue
 
             # Check content type & timestamp for fresh starts
             msg_date = msg.get("date", 0)
 
             # Early filter: drop messages with unwanted media types entirely
-            has_unwanted = any(msg.get(field) for field in _UNWANTED_MEDIA_FIELDS)
-            if has_unwanted:
-                stats["skipped_media_type"] += 1
+            # (set intersection first: most messages carry none of these keys)
+            if not _UNWANTED_MEDIA_FIELDS.isdisjoint(msg) and any(msg.get(f) for f in _UNWANTED_MEDIA_FIELDS):
+                skipped_media_type += 1
                 continue
 
             doc = msg.get("document")
@@ -248,27 +392,11 @@ class TelegramConnector(SourceConnector):
 
             cutoff = cutoff_time_media if has_document else cutoff_time_text
             if cutoff > 0 and msg_date < cutoff:
-                stats["skipped_old_timestamp"] += 1
+                skipped_old_timestamp += 1
                 continue
 
-            content_found = False
-
             # 1. Text Content — yield for text-only and text+document messages
             text_content = msg.get("text") or msg.get("caption")
-            if text_content:
-                logger.info(f"Processing update {update_id}: Found text content (Length: {len(text_content)})")
-                stats["yielded_items"] += 1
-                content_found = True
-                yield TelegramItem(
-                    external_id=str(msg["message_id"]) + "_text",
-                    data=text_content.encode("utf-8"),
-                    metadata={
-                        "filename": f"msg_{msg['message_id']}.txt",
-                        "timestamp": msg_date,
-                        "update_id": update_id,
-                        "is_text": True,
-                    },
-                )
 
             # 2. Document Content (only documents, not other media)
             if doc:
@@ -277,55 +405,217 @@ class TelegramConnector(SourceConnector):
 
                 # Skip APK
                 if file_name.lower().endswith(".apk"):
-                    logger.info(f"Skipping APK file in update {update_id}: {file_name}")
-                    stats["skipped_apk"] += 1
-                    # Do not treat as content found, unless text was found
+                    logger.info("Skipping APK file in update %s: %s", update_id, file_name)
+                    skipped_apk += 1
                     # If text was found, we yield text but skip file.
-                    pass
-                # Check file size (25MB limit)
-                elif file_size > 25 * 1024 * 1024:
-                    logger.warning(f"Skipping file {file_name} (Size: {file_size} > 25MB limit)")
-                    stats["skipped_size_limit"] += 1
+                    doc = None
+                # Check file size against the Bot API download limit
+                elif file_size > _MAX_DOWNLOAD_BYTES:
+                    logger.warning("Skipping file %s (Size: %s > 20MB Bot API limit)", file_name, file_size)
+                    skipped_size_limit += 1
+                    doc = None
                 else:
-                    file_id = doc.get("file_id")
+                    mime = doc.get("mime_type", "")
+                    if mime.startswith(_SKIPPED_MIME_PREFIXES) or mime in _SKIPPED_MIME_TYPES:
+                        logger.debug("Skipping %s file in update %s: %s", mime, update_id, file_name)
+                        skipped_media_type += 1
+                        doc = None
 
-                    logger.info(f"Processing update {update_id}: Found file {file_name} (ID: {file_id})")
-
-                    # Get File info
-                    file_info_resp = self._make_request("getFile", {"file_id": file_id})
-                    if not file_info_resp.get("ok"):
-                        logger.error(f"Failed to get file info for {file_id}: {file_info_resp}")
-                    else:
-                        file_path = file_info_resp["result"]["file_path"]
-
-                        # Download
-                        data = self._download_file(file_path)
-                        if data:
-                            stats["yielded_items"] += 1
-                            content_found = True
-                            yield TelegramItem(
-                                external_id=str(msg["message_id"]),
-                                data=data,
-                                metadata={
-                                    "filename": file_name,
-                                    "file_id": file_id,
-                                    "timestamp": msg_date,
-                                    "update_id": update_id,
-                                },
-                            )
-
-            if not content_found:
+            if not text_content and not doc:
                 # logger.debug(f"Update {update_id} skipped: No content (text/document)")
-                stats["skipped_no_content"] += 1
+                skipped_no_content += 1
+                continue
+
+            entries.append((update_id, msg, text_content, doc))
+
+        # Pass 2: yield in update order while getFile+download run ahead on a
+        # small pool, so round-trips for consecutive documents overlap.
+        doc_indexes = deque(i for i, entry in enumerate(entries) if entry[3])
+        futures: Dict[int, concurrent.futures.Future] = {}
+        pool = concurrent.futures.ThreadPoolExecutor(max_workers=_DOWNLOAD_WORKERS)
+        try:
+            for i, (update_id, msg, text_content, doc) in enumerate(entries):
+                while doc_indexes and len(futures) < _DOWNLOAD_WORKERS * 2:
+                    j = doc_indexes.popleft()
+                    futures[j] = pool.submit(self._fetch_document, entries[j][3]["file_id"])
+
+                # Update local offset tracking
+                self.offset = max(self.offset, update_id)
+                msg_date = msg.get("date", 0)
+                content_found = False
+
+                if text_content:
+                    logger.info("Processing update %s: Found text content (Length: %d)", update_id, len(text_content))
+                    yielded_items += 1
+                    content_found = True
+                    yield TelegramItem(
+                        external_id=str(msg["message_id"]) + "_text",
+                        data=text_content.encode("utf-8"),
+                        metadata={
+                            "filename": f"msg_{msg['message_id']}.txt",
+                            "timestamp": msg_date,
+                            "update_id": update_id,
+                            "is_text": True,
+                        },
+                    )
+
+                if doc:
+                    file_name = doc.get("file_name", "unknown")
+                    file_id = doc.get("file_id")
+                    logger.info("Processing update %s: Found file %s (ID: %s)", update_id, file_name, file_id)
+                    data = futures.pop(i).result()
+                    if data:
+                        yielded_items += 1
+                        content_found = True
+                        yield TelegramItem(
+                            external_id=str(msg["message_id"]),
+                            data=data,
+                            metadata={
+                                "filename": file_name,
+                                "file_id": file_id,
+                                "timestamp": msg_date,
+                                "update_id": update_id,
+                            },
+                        )
+
+                if not content_found:
+                    skipped_no_content += 1
+
+            # Every remaining update was filtered out in pass 1
+            self.offset = max(self.offset, last_update_id)
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+            self._close_sessions()
+            with shared.lock:
+                shared.consumed[chat_key] = self.offset
+                self._trim_cache(shared)
 
         logger.info(
             f"[BotAPI] ═══ Done chat={self.target_chat_id} ═══  "
-            f"processed={stats['processed_updates']}  yielded={stats['yielded_items']}  "
-            f"skipped: chat_mismatch={stats['skipped_chat_mismatch']}  "
-            f"media_type={stats['skipped_media_type']}  cutoff={stats['skipped_old_timestamp']}  "
-            f"no_content={stats['skipped_no_content']}  apk={stats['skipped_apk']}  "
-            f"size_limit={stats['skipped_size_limit']}"
+            f"processed={processed_updates}  yielded={yielded_items}  "
+            f"skipped: chat_mismatch={skipped_chat_mismatch}  "
+            f"media_type={skipped_media_type}  cutoff={skipped_old_timestamp}  "
+            f"no_content={skipped_no_content}  apk={skipped_apk}  "
+            f"size_limit={skipped_size_limit}"
         )
 
+    def _poll_updates(self, shared: _SharedState) -> int:
+        """Drain pending updates into the shared cache; returns how many were fetched.
+
+        Callers hold shared.lock.
+        """
+        has_more = True
+
+        current_max_update_id = shared.last_offset
+        fetched_updates_count = 0
+
+        while has_more:
+            # We request updates starting from the last known biggest update_id + 1
+            # Note: Telegram getUpdates offset is "identifier of the first update to be returned".
+
+            req_offset = current_max_update_id + 1 if current_max_update_id > 0 else 0
+
+            resp = self._make_request(
+                "getUpdates",
+                {
+                    "offset": req_offset,
+                    "timeout": self._poll_timeout,
+                    "limit": _POLL_LIMIT,
+                    "allowed_updates": ["channel_post", "message"],
+                },
+            )
+
+            if not resp.get("ok"):
+                logger.warning(f"getUpdates returned not OK: {resp}")
+                break
+
+            updates = resp.get("result", [])
+            fetched_updates_count += len(updates)
+
+            if not updates:
+                has_more = False
+                break
+
+            # getUpdates returns ascending ids, so the last one is the newest.
+            # An id already cached carries the same payload, so a bulk update
+            # is safe and grows the dict once per page.
+            current_max_update_id = max(current_max_update_id, updates[-1]["update_id"])
+            shared.updates.update({update["update_id"]: update for update in updates})
+
+            shared.last_offset = current_max_update_id
+
+            # A short page means the backlog is drained; polling again would
+            # just cost another round trip (or block for a long-poll timeout).
+            if len(updates) < _POLL_LIMIT:
+                has_more = False
+                # getUpdates only confirms ids below the requested offset, so
+                # acknowledge the last page now or Telegram re-sends it on the
+                # next run (the cache does not survive a restart).
+                self._make_request(
+                    "getUpdates",
+                    {"offset": current_max_update_id + 1, "limit": 1, "timeout": 0},
+                )
+
+        return fetched_updates_count
+
+    @staticmethod
+    def _trim_cache(shared: _SharedState):
+        """Evict the oldest updates beyond _MAX_CACHED_UPDATES that every
+        source reading this bot has already consumed.
+
+        Callers hold shared.lock.
+        """
+        cache = shared.updates
+        overflow = len(cache) - _MAX_CACHED_UPDATES
+        if overflow <= 0:
+            return
+        low_mark = min(shared.consumed.values())
+        # Dicts keep insertion order, which is ascending update_id
+        evict = list(itertools.takewhile(lambda uid: uid <= low_mark, itertools.islice(cache, overflow)))
+        for old_id in evict:
+            del cache[old_id]
+        if evict:
+            logger.warning(f"[BotAPI] Update cache full; evicted {len(evict)} consumed update(s)")
+
+    def _cached_file_path(self, file_id: str) -> Optional[str]:
+        key = (self.token, file_id)
+        with self._file_paths_lock:
+            cached = self._file_paths.get(key)
+            if cached is None:
+                return None
+            if time.time() - cached[1] > _FILE_PATH_TTL:
+                del self._file_paths[key]
+                return None
+            return cached[0]
+
+    def _remember_file_path(self, file_id: str, file_path: Optional[str]):
+        key = (self.token, file_id)
+        with self._file_paths_lock:
+            if file_path is None:
+                self._file_paths.pop(key, None)
+                return
+            self._file_paths[key] = (file_path, time.time())
+            self._file_paths.move_to_end(key)
+            while len(self._file_paths) > _MAX_CACHED_FILE_PATHS:
+                self._file_paths.popitem(last=False)
+
+    def _fetch_document(self, file_id: str) -> Optional[bytes]:
+        """Resolve a file_id via getFile and download it. Runs on the download pool."""
+        file_path = self._cached_file_path(file_id)
+        if file_path is not None:
+            data = self._download_file(file_path)
+            if data is not None:
+                return data
+            # The link may have expired early; resolve it again below
+            self._remember_file_path(file_id, None)
+
+        file_info_resp = self._make_request("getFile", {"file_id": file_id})
+        if not file_info_resp.get("ok"):
+            logger.error(f"Failed to get file info for {file_id}: {file_info_resp}")
+            return None
+        file_path = file_info_resp["result"]["file_path"]
+        self._remember_file_path(file_id, file_path)
+        return self._download_file(file_path)
+
     def get_state(self) -> Dict[str, Any]:
         return {"offset": self.offset}
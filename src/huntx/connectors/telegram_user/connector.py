@@ -1,6 +1,8 @@
+import asyncio
 import logging
 import time
 import threading
+import weakref
 from dataclasses import dataclass
 from typing import Dict, Any, Optional, Iterator, List
 from telethon.sync import TelegramClient
@@ -20,6 +22,9 @@ _TEXT_BATCH_SIZE = 100
 _MAX_RECONNECT_RETRIES = 10
 _RECONNECT_DELAYS = (2, 2, 4, 4, 8, 8, 16, 16, 32, 32)  # seconds per retry attempt
 
+# Documents downloaded concurrently in pass 2
+_DOWNLOAD_CONCURRENCY = 4
+
 
 @dataclass
 class SourceItem:
@@ -65,6 +70,20 @@ class TelegramUserConnector:
                 logger.error(f"[MTProto] Connection failed: {e}")
                 raise
 
+    def _get_entity(self, client: TelegramClient, ref):
+        """client.get_entity, cached per client so each peer resolves once per connection.
+
+        The orchestrator resolves a peer for dedup and then again to list it;
+        without the cache both cost a round-trip on every run.
+        """
+        if not hasattr(self._local, "entities"):
+            self._local.entities = weakref.WeakKeyDictionary()
+        cache = self._local.entities.setdefault(client, {})
+        entity = cache.get(ref)
+        if entity is None:
+            entity = cache[ref] = client.get_entity(ref)
+        return entity
+
     def _resolve_peer(self, peer_entity, client: TelegramClient = None):
         """Resolve a peer identifier to a Telegram entity.
 
@@ -75,7 +94,7 @@ class TelegramUserConnector:
         if client and isinstance(peer_entity, str) and peer_entity.startswith("-100"):
             try:
                 # Use get_entity with the full marked ID — Telethon handles it
-                entity = client.get_entity(int(peer_entity))
+                entity = self._get_entity(client, int(peer_entity))
                 logger.debug(f"[MTProto] Resolved {peer_entity} via API -> {type(entity).__name__}")
                 return entity
             except Exception as e:
@@ -106,8 +125,8 @@ class TelegramUserConnector:
         client = self._client()
         self._ensure_connected(client)
         try:
-            entity = client.get_entity(
-                int(self.peer) if self.peer.lstrip("-").isdigit() else self.peer
+            entity = self._get_entity(
+                client, int(self.peer) if self.peer.lstrip("-").isdigit() else self.peer
             )
             raw_id = getattr(entity, "id", None)
             if raw_id:
@@ -245,9 +264,31 @@ class TelegramUserConnector:
         stats["_text_bytes"] = total_bytes
 
     # ------------------------------------------------------------------
-    # Pass 2: Document messages (slow, downloads, one-by-one)
+    # Pass 2: Document messages (slow, downloads in small concurrent windows)
     # ------------------------------------------------------------------
 
+    @staticmethod
+    def _download_many(client, msgs) -> list:
+        """Download documents for msgs, concurrently when there is more than one.
+
+        Returns one entry per message, in order: the bytes, or the exception the
+        download raised.
+        """
+        if len(msgs) == 1:
+            try:
+                return [client.download_media(msgs[0], file=bytes)]
+            except Exception as e:
+                return [e]
+
+        async def gather():
+            # Inside a running loop telethon.sync hands back the coroutines, so
+            # the downloads share the client's connections and overlap.
+            return await asyncio.gather(
+                *(client.download_media(m, file=bytes) for m in msgs), return_exceptions=True
+            )
+
+        return client.loop.run_until_complete(gather())
+
     def _fetch_document_pass(self, client, peer_entity, last_id, cutoff_file, stats) -> Iterator[SourceItem]:
         """Use Telegram's server-side InputMessagesFilterDocument to iterate
         only over messages that contain documents. Downloads happen here."""
@@ -256,14 +297,51 @@ class TelegramUserConnector:
         yielded = 0
         total_bytes = 0
         resume_after_id = last_id  # track progress for reconnect resume
+        # Messages waiting for download; flushed _DOWNLOAD_CONCURRENCY at a time
+        pending: List[Any] = []
 
         logger.info(
             f"[MTProto] ── Pass 2: Documents (server-filtered) ──  peer={self.peer}  min_id={last_id}"
         )
 
+        def flush() -> Iterator[SourceItem]:
+            nonlocal yielded, total_bytes
+            results = self._download_many(client, [msg for msg, _ in pending])
+            for result in results:
+                msg, f = pending[0]
+                if isinstance(result, ConnectionError):
+                    raise result  # outer handler reconnects and resumes from pending
+                pending.pop(0)
+                # gather(return_exceptions=True) also hands back CancelledError,
+                # which is a BaseException rather than an Exception
+                if isinstance(result, BaseException):
+                    logger.error("[MTProto] Download failed msg %s: %s", msg.id, result)
+                    stats["download_errors"] += 1
+                    continue
+                if not result:
+                    continue
+
+                if f and f.name:
+                    filename = f.name
+                else:
+                    ext = f.ext if f and f.ext else ""
+                    filename = f"media_{msg.id}{ext}"
+
+                total_bytes += len(result)
+                stats["media_messages"] += 1
+                yielded += 1
+
+                yield SourceItem(
+                    external_id=str(msg.id) + "_media",
+                    data=result,
+                    metadata={"filename": filename, "timestamp": msg.date.timestamp()},
+                )
+
         retries = 0
         while retries <= _MAX_RECONNECT_RETRIES:
           try:
+            if pending:
+                yield from flush()
             for msg in client.iter_messages(
                 peer_entity, min_id=resume_after_id, reverse=True,
                 filter=InputMessagesFilterDocument,
@@ -299,42 +377,30 @@ class TelegramUserConnector:
                         elif f.ext and f.ext.lower() == ".apk":
                             is_apk = True
                         if is_apk:
-                            logger.debug(f"[MTProto] Skipping APK in msg {msg.id}: {f.name or '?'}")
+                            logger.debug("[MTProto] Skipping APK in msg %s: %s", msg.id, f.name or "?")
                             stats["skipped_apk"] += 1
                             continue
 
                     # Size limit (25 MB)
                     if f and f.size and f.size > 25 * 1024 * 1024:
-                        size_mb = f.size / (1024 * 1024)
-                        logger.info(f"[MTProto] Skipping oversized file msg {msg.id} ({size_mb:.1f} MB)")
+                        logger.info(
+                            "[MTProto] Skipping oversized file msg %s (%.1f MB)", msg.id, f.size / (1024 * 1024)
+                        )
                         stats["skipped_size_limit"] += 1
                         continue
-
-                    data = client.download_media(msg, file=bytes)
-                    if data:
-                        filename = "unknown"
-                        if f and f.name:
-                            filename = f.name
-                        else:
-                            ext = ""
-                            if f and f.ext:
-                                ext = f.ext
-                            filename = f"media_{msg.id}{ext}"
-
-                        total_bytes += len(data)
-                        stats["media_messages"] += 1
-                        yielded += 1
-
-                        yield SourceItem(
-                            external_id=str(msg.id) + "_media",
-                            data=data,
-                            metadata={"filename": filename, "timestamp": msg.date.timestamp()},
-                        )
                 except ConnectionError:
                     raise  # let outer handler deal with reconnect
                 except Exception as e:
-                    logger.error(f"[MTProto] Download failed msg {msg.id}: {e}")
+                    logger.error("[MTProto] Download failed msg %s: %s", msg.id, e)
                     stats["download_errors"] += 1
+                    continue
+
+                pending.append((msg, f))
+                if len(pending) >= _DOWNLOAD_CONCURRENCY:
+                    yield from flush()
+
+            if pending:
+                yield from flush()
 
             break  # completed successfully, exit retry loop
 
@@ -2,7 +2,6 @@ import asyncio
 import concurrent.futures
 import base64
 import datetime
-import json
 import logging
 import time
 import queue
@@ -21,12 +20,57 @@ from ..pipeline.build import BuildPipeline
 from ..pipeline.publish import PublishPipeline
 from ..formats.npvt import strip_proxy_remark, add_clean_remark
 from ..config.schema import AppConfig
+from ..utils.jsonfast import dumps_bytes, loads as json_loads
 
 logger = logging.getLogger(__name__)
 
 # Default number of parallel ingestion workers
 DEFAULT_MAX_WORKERS = 3
 
+# Derived-format suffixes that get their own output filename, checked in order
+_OUTPUT_SUFFIX_RULES = (
+    (".decoded.json", "_decoded.json"),
+    (".b64sub", "_b64sub.txt"),
+)
+
+# Run banners, formatted lazily by logging
+_RUN_START_TMPL = (
+    "[Orchestrator] ╔══════════════════════════════════════════╗\n"
+    "[Orchestrator] ║  Run %d                              ║\n"
+    "[Orchestrator] ╚══════════════════════════════════════════╝\n"
+    "[Orchestrator] sources=%d  routes=%d  workers=%d  fetch_windows=%s  "
+    "delta_seen_files_id>%s  timeout=%s"
+)
+_RUN_COMPLETE_TMPL = (
+    "[Orchestrator] ╔══════════════════════════════════════════╗\n"
+    "[Orchestrator] ║  Run %d COMPLETE                     ║\n"
+    "[Orchestrator] ╚══════════════════════════════════════════╝\n"
+    "[Orchestrator] Total duration: %.2fs\n"
+    "[Orchestrator]   Phase 1 Ingest:    %.1fs  (%d ok, %d err)\n"
+    "[Orchestrator]   Phase 2 Transform: %.1fs\n"
+    "[Orchestrator]   Phase 3 Build/Pub: %.1fs  (%d artifacts, %d publish failures)\n"
+    "[Orchestrator]   Phase 4 Cleanup:   %.1fs"
+)
+
+# Per-thread event loop for ingest workers (Telethon's sync client needs one)
+_tls = threading.local()
+
+
+def _thread_event_loop() -> asyncio.AbstractEventLoop:
+    """Return this thread's event loop, creating and installing it on first use."""
+    loop = getattr(_tls, "loop", None)
+    if loop is None or loop.is_closed():
+        loop = _tls.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+    return loop
+
+
+def _close_thread_event_loop():
+    loop = getattr(_tls, "loop", None)
+    if loop is not None and not loop.is_closed():
+        loop.close()
+    _tls.loop = None
+
 
 class Orchestrator:
     def __init__(self, config: AppConfig, max_workers: int = DEFAULT_MAX_WORKERS, fetch_windows: dict = None):
@@ -38,6 +82,7 @@ class Orchestrator:
             "file_fresh_hours": 48,
             "msg_subsequent_hours": 0,
             "file_subsequent_hours": 0,
+            "poll_timeout": 0,
         }
 
         self.raw_store = RawStore()
@@ -47,13 +92,6 @@ class Orchestrator:
         self.repo = StateRepo(self.db)
         logger.debug(f"[Orchestrator] State DB at {paths.STATE_DB_PATH}")
 
-        # Optimization: Enable WAL mode for better concurrency (readers don't block writers)
-        try:
-            with self.db.connect() as conn:
-                conn.execute("PRAGMA journal_mode=WAL;")
-        except Exception as e:
-            logger.warning(f"[Orchestrator] Could not set WAL mode: {e}")
-
         self.registry = FormatRegistry.get_instance()
         register_all_formats(self.registry, self.raw_store)
 
@@ -63,6 +101,16 @@ class Orchestrator:
         self.transform_pipeline = TransformPipeline(self.raw_store, self.repo, self.registry, source_configs, max_workers=self.max_workers)
         self.build_pipeline = BuildPipeline(self.repo, self.artifact_store, self.registry)
         self.publish_pipeline = PublishPipeline(self.repo)
+        # Routes are static config: build each route's dict and serialized
+        # destinations once here instead of on every run.
+        self._route_plans = [
+            (
+                route,
+                {"name": route.name, "formats": route.formats, "from_sources": route.from_sources},
+                [d.model_dump() for d in route.destinations],
+            )
+            for route in self.config.routes
+        ]
         self._seen_channels: set = set()   # canonical channel IDs for dedup
         self._seen_lock = threading.Lock()
         logger.info(
@@ -122,19 +170,21 @@ class Orchestrator:
         files_written = 0
         total_bytes = 0
 
-        for filename, data in output_payloads.items():
-            path = out_dir / filename
-            try:
-                if isinstance(data, bytes):
-                    path.write_bytes(data)
-                else:
-                    path.write_text(str(data), encoding="utf-8")
-                size = path.stat().st_size
-                total_bytes += size
-                files_written += 1
-                logger.info(f"[Export] Written {filename} ({size / 1024:.1f} KB)")
-            except Exception as e:
-                logger.error(f"[Export] Failed to write {filename}: {e}")
+        # Files are independent, so overlap their writes on a small pool
+        if output_payloads:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=min(8, len(output_payloads))) as ex:
+                futures = {
+                    ex.submit(self._write_output, out_dir / filename, data): filename
+                    for filename, data in output_payloads.items()
+                }
+                for fut, filename in futures.items():
+                    try:
+                        size = fut.result()
+                        total_bytes += size
+                        files_written += 1
+                        logger.info(f"[Export] Written {filename} ({size / 1024:.1f} KB)")
+                    except Exception as e:
+                        logger.error(f"[Export] Failed to write {filename}: {e}")
 
         if files_written == 0:
             logger.warning("[Export] No artifacts produced — outputs/ not updated.")
@@ -144,21 +194,27 @@ class Orchestrator:
                 f"({total_bytes / 1024:.1f} KB total)"
             )
 
+    @staticmethod
+    def _write_output(path: Path, data) -> int:
+        """Write one artifact and return its size in bytes."""
+        # Encode once and write in one call; the size is the payload length
+        payload = data if isinstance(data, bytes) else str(data).encode("utf-8")
+        path.write_bytes(payload)
+        return len(payload)
+
     @staticmethod
     def _output_filename(route: str, fmt: str) -> str:
         """Determine the output filename for a route+format pair."""
-        if fmt.endswith(".decoded.json"):
-            return f"{route}_{fmt.replace('.decoded.json', '')}_decoded.json"
-        elif fmt.endswith(".b64sub"):
-            return f"{route}_{fmt.replace('.b64sub', '')}_b64sub.txt"
-        else:
-            return f"{route}.{fmt}"
+        for suffix, replacement in _OUTPUT_SUFFIX_RULES:
+            if fmt.endswith(suffix):
+                return f"{route}_{fmt[:-len(suffix)]}{replacement}"
+        return f"{route}.{fmt}"
 
     # ------------------------------------------------------------------
     # Dev output export
     # ------------------------------------------------------------------
 
-    def _export_dev_outputs(self, all_build_results: list):
+    def _export_dev_outputs(self):
         """Accumulate proxy URIs into outputs_dev/ as an all-time cumulative set.
 
         Writes three files from the accumulated state:
@@ -177,22 +233,17 @@ class Orchestrator:
         manifest: dict = {}  # {uri_string: first_seen_epoch}
         if manifest_path.exists():
             try:
-                manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
-            except (json.JSONDecodeError, OSError) as e:
+                # Parse the raw bytes directly; no intermediate decoded str
+                manifest = json_loads(manifest_path.read_bytes())
+            except (ValueError, OSError) as e:
                 logger.warning(f"[DevExport] Could not read manifest, starting fresh: {e}")
 
         # ── Add all known npvt/npvtsub records from state DB ────────
         source_ids = [s.id for s in self.config.sources]
-        history_records = self.repo.get_records_for_build(["npvt", "npvtsub"], source_ids)
+        history_lines = self.repo.get_record_lines_for_build(["npvt", "npvtsub"], source_ids)
 
         added = 0
-        for rec in history_records:
-            data = rec.get("data")
-            if not isinstance(data, dict):
-                continue
-            line = data.get("line")
-            if not isinstance(line, str):
-                continue
+        for line in history_lines:
             uri = line.strip()
             if not uri or "://" not in uri:
                 continue
@@ -211,7 +262,7 @@ class Orchestrator:
             return
 
         # ── Save manifest ─────────────────────────────────────────────
-        manifest_path.write_text(json.dumps(manifest), encoding="utf-8")
+        manifest_path.write_bytes(dumps_bytes(manifest))
 
         # ── Sort URIs deterministically (newest first, then alpha) ────
         sorted_uris = sorted(manifest.keys(), key=lambda u: (-manifest[u], u))
@@ -222,26 +273,32 @@ class Orchestrator:
         remarked_uris = [add_clean_remark(u, remark_counter) for u in sorted_uris]
 
         # ── proxies.txt ───────────────────────────────────────────────
+        # The joined list is encoded once and shared with the b64 subscription
+        plain = "\n".join(remarked_uris).encode("utf-8")
         txt_path = dev_dir / "proxies.txt"
         header = (
             f"# huntx proxy list \u2014 {ts_str}\n"
             f"# All-time cumulative history \u2014 {len(remarked_uris)} unique URIs\n"
             f"# One proxy URI per line\n\n"
-        )
-        txt_path.write_text(header + "\n".join(remarked_uris) + "\n", encoding="utf-8")
+        ).encode("utf-8")
+        # Write the pieces in sequence rather than concatenating a second copy
+        with open(txt_path, "wb") as f:
+            f.write(header)
+            f.write(plain)
+            f.write(b"\n")
+        txt_size = len(header) + len(plain) + 1
         logger.info(
             f"[DevExport] Written {txt_path.name} "
-            f"({len(sorted_uris)} URIs, {txt_path.stat().st_size / 1024:.1f} KB)"
+            f"({len(sorted_uris)} URIs, {txt_size / 1024:.1f} KB)"
         )
 
         # ── proxies_b64sub.txt ────────────────────────────────────────
         b64_path = dev_dir / "proxies_b64sub.txt"
-        plain = "\n".join(remarked_uris)
-        b64_payload = base64.b64encode(plain.encode("utf-8")).decode("ascii")
-        b64_path.write_text(b64_payload + "\n", encoding="utf-8")
+        b64_payload = base64.b64encode(plain) + b"\n"
+        b64_path.write_bytes(b64_payload)
         logger.info(
             f"[DevExport] Written {b64_path.name} "
-            f"({b64_path.stat().st_size / 1024:.1f} KB)"
+            f"({len(b64_payload) / 1024:.1f} KB)"
         )
 
         # ── proxies.json ─────────────────────────────────────────────
@@ -255,9 +312,7 @@ class Orchestrator:
                 for raw, remarked in zip(sorted_uris, remarked_uris)
             ],
         }
-        json_path.write_text(
-            json.dumps(wrapped, indent=2, ensure_ascii=False), encoding="utf-8"
-        )
+        json_path.write_bytes(dumps_bytes(wrapped, indent=True))
         logger.info(
             f"[DevExport] Written {json_path.name} "
             f"({json_path.stat().st_size / 1024:.1f} KB)"
@@ -281,27 +336,30 @@ class Orchestrator:
             logger.warning(f"[Orchestrator] Could not read seen_files max id: {e}")
             return 0
 
-    def _ingest_one_source(self, src_conf) -> bool:
-        """Ingest a single source. Designed for thread-pool execution."""
-        loop = None
-        # Always create a new loop for this thread to ensure isolation and avoid deprecation warnings
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
+    def _ingest_one_source(self, src_conf, state: dict | None = None) -> bool:
+        """Ingest a single source. Designed for thread-pool execution.
 
-        from ..connectors.telegram.connector import TelegramConnector
-        from ..connectors.telegram_user.connector import TelegramUserConnector
+        ``state`` is the source's stored state, preloaded in bulk by ``run()``.
+        """
+        # Sources on the same worker thread share one loop; MTProto clients are
+        # disconnected after each source, so nothing stays bound to it.
+        _thread_event_loop()
 
         try:
+            # Connectors are imported per branch so a Bot-API-only config never
+            # pays for importing Telethon (pulled in by the MTProto connector).
             if src_conf.type == "telegram" and src_conf.telegram:
                 if not src_conf.telegram.token:
                     logger.warning(f"[Worker] Skipping {src_conf.id}: Missing Telegram bot token.")
                     return False
 
+                from ..connectors.telegram.connector import TelegramConnector
+
                 logger.info(f"[Worker] Ingesting source {src_conf.id} (Bot API)")
                 bot_conn = TelegramConnector(
                     token=src_conf.telegram.token,
                     chat_id=src_conf.telegram.chat_id,
-                    state=self.repo.get_source_state(src_conf.id),
+                    state=state,
                     fetch_windows=self.fetch_windows,
                 )
                 self.ingest_pipeline.run(src_conf.id, bot_conn, source_type=src_conf.type)
@@ -311,13 +369,15 @@ class Orchestrator:
                     logger.warning(f"[Worker] Skipping {src_conf.id}: Missing API ID or Hash.")
                     return False
 
+                from ..connectors.telegram_user.connector import TelegramUserConnector
+
                 logger.info(f"[Worker] Ingesting source {src_conf.id} (MTProto)")
                 user_conn = TelegramUserConnector(
                     api_id=src_conf.telegram_user.api_id,
                     api_hash=src_conf.telegram_user.api_hash,
                     session=src_conf.telegram_user.session,
                     peer=src_conf.telegram_user.peer,
-                    state=self.repo.get_source_state(src_conf.id),
+                    state=state,
                     fetch_windows=self.fetch_windows,
                 )
                 # Dedup: resolve canonical channel ID and skip if already seen
@@ -344,30 +404,28 @@ class Orchestrator:
         except Exception as e:
             logger.exception(f"[Worker] Ingest failed for {src_conf.id}: {e}")
             return False
-        finally:
-            # Clean up the event loop if we created a new one for this thread
-            if loop and not loop.is_closed():
-                loop.close()
 
-    def _worker(self, source_queue: queue.Queue, results: dict, lock: threading.Lock):
+    def _worker(self, source_queue: queue.SimpleQueue, results: dict, lock: threading.Lock):
         """
         Pool worker: pull sources from the shared queue until it is empty.
         Each source is fully processed before the next one is taken, and
         no two workers can take the same source (guaranteed by queue).
         """
-        while True:
-            try:
-                src_conf = source_queue.get_nowait()
-            except queue.Empty:
-                return  # pool exhausted
-
-            success = self._ingest_one_source(src_conf)
-            with lock:
-                if success:
-                    results["ok"] += 1
-                else:
-                    results["err"] += 1
-            source_queue.task_done()
+        try:
+            while True:
+                try:
+                    src_conf, state = source_queue.get_nowait()
+                except queue.Empty:
+                    return  # pool exhausted
+
+                success = self._ingest_one_source(src_conf, state)
+                with lock:
+                    if success:
+                        results["ok"] += 1
+                    else:
+                        results["err"] += 1
+        finally:
+            _close_thread_event_loop()
 
     # ------------------------------------------------------------------
     # Main run
@@ -404,20 +462,19 @@ class Orchestrator:
                 )
 
         logger.info(
-            f"[Orchestrator] ╔══════════════════════════════════════════╗\n"
-            f"[Orchestrator] ║  Run {run_id}                              ║\n"
-            f"[Orchestrator] ╚══════════════════════════════════════════╝\n"
-            f"[Orchestrator] sources={total_sources}  routes={total_routes}  "
-            f"workers={effective_workers}  fetch_windows={self.fetch_windows}  "
-            f"delta_seen_files_id>{seen_file_cutoff_id}  timeout={timeout}"
+            _RUN_START_TMPL, run_id, total_sources, total_routes, effective_workers,
+            self.fetch_windows, seen_file_cutoff_id, timeout,
         )
 
         # ── Phase 1: Ingestion (pool-based) ──────────────────────────
         try:
             ingest_start = time.time()
-            source_queue: queue.Queue = queue.Queue()
+            # One query for every source's state instead of one per worker call
+            states = self.repo.get_source_states([s.id for s in self.config.sources])
+            # Threads are joined directly, so no task_done()/join() bookkeeping is needed
+            source_queue: queue.SimpleQueue = queue.SimpleQueue()
             for src in self.config.sources:
-                source_queue.put(src)
+                source_queue.put((src, states.get(src.id)))
 
             lock = threading.Lock()
 
@@ -488,16 +545,11 @@ class Orchestrator:
                 # This allows Route B to start building while Route A is still publishing (I/O wait).
                 future_to_meta = {}
 
-                for route in self.config.routes:
+                for route, route_base, dests in self._route_plans:
                     try:
                         # Removed _raise_if_timed_out check here to ensure we try to build
 
-                        route_dict = {
-                            "name": route.name,
-                            "formats": route.formats,
-                            "from_sources": route.from_sources,
-                            "min_seen_file_id": seen_file_cutoff_id,
-                        }
+                        route_dict = {**route_base, "min_seen_file_id": seen_file_cutoff_id}
                         build_results = self.build_pipeline.run(route_dict)
                         if not build_results:
                             logger.info(f"[Orchestrator] Route '{route.name}': no artifacts produced.")
@@ -506,16 +558,6 @@ class Orchestrator:
                         total_artifacts += len(build_results)
                         all_build_results.extend(build_results)
 
-                        dests = [
-                            {
-                                "chat_id": d.chat_id,
-                                "mode": d.mode,
-                                "caption_template": d.caption_template,
-                                "token": d.token,
-                            }
-                            for d in route.destinations
-                        ]
-
                         # Submit tasks to the shared executor
                         for res in build_results:
                             # Removed _raise_if_timed_out check here
@@ -575,7 +617,7 @@ class Orchestrator:
             logger.error(f"[Orchestrator] Output export failed: {e}")
 
         try:
-            self._export_dev_outputs(all_build_results)
+            self._export_dev_outputs()
         except Exception as e:
             logger.error(f"[Orchestrator] Dev export failed: {e}")
 
@@ -592,15 +634,11 @@ class Orchestrator:
         duration = time.time() - start_time
 
         logger.info(
-            f"[Orchestrator] ╔══════════════════════════════════════════╗\n"
-            f"[Orchestrator] ║  Run {run_id} COMPLETE                     ║\n"
-            f"[Orchestrator] ╚══════════════════════════════════════════╝\n"
-            f"[Orchestrator] Total duration: {duration:.2f}s\n"
-            f"[Orchestrator]   Phase 1 Ingest:    {ingest_duration:.1f}s  ({results['ok']} ok, {results['err']} err)\n"
-            f"[Orchestrator]   Phase 2 Transform: {transform_duration:.1f}s\n"
-            f"[Orchestrator]   Phase 3 Build/Pub: {build_duration:.1f}s  "
-            f"({total_artifacts} artifacts, {publish_failures} publish failures)\n"
-            f"[Orchestrator]   Phase 4 Cleanup:   {cleanup_duration:.1f}s"
+            _RUN_COMPLETE_TMPL, run_id, duration,
+            ingest_duration, results["ok"], results["err"],
+            transform_duration,
+            build_duration, total_artifacts, publish_failures,
+            cleanup_duration,
         )
 
         if build_err > 0:
@@ -1,62 +1,58 @@
 import base64
 import binascii
 
-# All known proxy URI schemes for content-based detection
+# All known proxy URI schemes for content-based detection (ASCII, matched as bytes)
 _PROXY_URI_PREFIXES = (
-    "vmess://", "vless://", "trojan://",
-    "ss://", "ssr://",
-    "hysteria2://", "hy2://", "hysteria://",
-    "tuic://",
-    "wireguard://", "wg://",
-    "socks://", "socks5://", "socks4://",
-    "anytls://",
-    "juicity://",
-    "warp://",
-    "dns://", "dnstt://",
+    b"vmess://", b"vless://", b"trojan://",
+    b"ss://", b"ssr://",
+    b"hysteria2://", b"hy2://", b"hysteria://",
+    b"tuic://",
+    b"wireguard://", b"wg://",
+    b"socks://", b"socks5://", b"socks4://",
+    b"anytls://",
+    b"juicity://",
+    b"warp://",
+    b"dns://", b"dnstt://",
 )
 
+# File extension -> format ID. Dedicated opaque/binary formats sit next to
+# the text ones; .npvtsub is a subscription text (VLESS/VMESS/Trojan URIs).
+_EXTENSION_FORMATS = {
+    "ovpn": "ovpn",
+    "npv4": "npv4",
+    "conf": "conf_lines",
+    "ehi": "ehi",
+    "hc": "hc",
+    "hat": "hat",
+    "sip": "sip",
+    "nm": "nm",
+    "dark": "dark",
+    "npvtsub": "npvtsub",
+}
+
 
 def decide_format(filename: str, content: bytes) -> str:
     """
     Decides the format ID based on filename extension and content.
     """
-    fn = filename.lower()
-
-    # Extension based
-    if fn.endswith(".ovpn"):
-        return "ovpn"
-    if fn.endswith(".npv4"):
-        return "npv4"
-    if fn.endswith(".conf"):
-        return "conf_lines"
-
-    # Dedicated opaque/binary formats
-    if fn.endswith(".ehi"):
-        return "ehi"
-    if fn.endswith(".hc"):
-        return "hc"
-    if fn.endswith(".hat"):
-        return "hat"
-    if fn.endswith(".sip"):
-        return "sip"
-    if fn.endswith(".nm"):
-        return "nm"
-    if fn.endswith(".dark"):
-        return "dark"
-
-    # .npvtsub is a subscription text (VLESS/VMESS/Trojan URIs)
-    if fn.endswith(".npvtsub"):
-        return "npvtsub"
-
-    # Content based heuristics — detect proxy URI lines
-    text_preview = content[:2048].decode("utf-8", errors="ignore")
-    if any(scheme in text_preview for scheme in _PROXY_URI_PREFIXES):
+    # Extension based: one dict lookup on the lowercased suffix
+    _, dot, ext = filename.rpartition(".")
+    if dot:
+        fmt = _EXTENSION_FORMATS.get(ext.lower())
+        if fmt:
+            return fmt
+
+    # Content based heuristics — detect proxy URI lines. The needles are
+    # ASCII, so the preview is scanned as bytes without decoding it.
+    preview = content[:2048]
+    has_scheme_sep = b"://" in preview
+    if has_scheme_sep and any(scheme in preview for scheme in _PROXY_URI_PREFIXES):
         return "npvt"
     # Also detect base64-encoded subscription content
-    clean = text_preview.strip()
-    if clean and "://" not in clean and " " not in clean and len(clean) > 20:
+    clean = preview.strip()
+    if clean and not has_scheme_sep and b" " not in clean and len(clean) > 20:
         try:
-            decoded = base64.b64decode(clean[:512] + "==").decode("utf-8", errors="ignore")
+            decoded = base64.b64decode(clean[:512] + b"==")
             if any(scheme in decoded for scheme in _PROXY_URI_PREFIXES):
                 return "npvt"
         except (binascii.Error, ValueError):
@@ -7,6 +7,9 @@ def normalize_text(text: str) -> str:
     """
     if not text:
         return ""
+    # NFKC leaves pure ASCII unchanged, so skip the normalizer for it
+    if text.isascii():
+        return text.strip()
     # NFKC normalization for compatibility
     text = unicodedata.normalize("NFKC", text)
     # Strip whitespace
@@ -12,10 +12,14 @@ class ConfLinesHandler(FormatHandler):
     def parse(self, raw_data: bytes, source_info: Dict[str, Any]) -> List[Dict[str, Any]]:
         text = raw_data.decode("utf-8", errors="ignore")
         records = []
+        # Repeated lines would yield the same unique_hash; skip them before
+        # hashing so SHA-256 runs once per distinct line
+        seen = set()
         for line in text.splitlines():
             clean = normalize_text(line)
-            if not clean or clean.startswith("#"):
+            if not clean or clean.startswith("#") or clean in seen:
                 continue
+            seen.add(clean)
 
             # Record structure
             record = {"unique_hash": hash_string(clean), "data": {"line": clean}}
@@ -23,17 +27,12 @@ class ConfLinesHandler(FormatHandler):
         return records
 
     def build(self, records: List[Dict[str, Any]]) -> bytes:
-        lines = []
-        seen = set()
-        for r in records:
-            line = None
-            if isinstance(r, dict):
-                data = r.get("data")
-                if isinstance(data, dict):
-                    line = data.get("line")
-            if not line:
-                continue
-            if line not in seen:
-                lines.append(line)
-                seen.add(line)
-        return "\n".join(lines).encode("utf-8")
+        lines = [
+            line
+            for r in records
+            if isinstance(r, dict)
+            and isinstance(data := r.get("data"), dict)
+            and (line := data.get("line"))
+        ]
+        # dict.fromkeys dedups in C and keeps first-seen order
+        return "\n".join(dict.fromkeys(lines)).encode("utf-8")
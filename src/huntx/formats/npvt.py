@@ -2,10 +2,12 @@ import base64
 import binascii
 import json
 import re
+import string
 from typing import List, Dict, Any
 from .base import FormatHandler
 from .common.normalize_text import normalize_text
 from .common.hashing import hash_string
+from ..utils.b64fast import b64decode
 
 # All known proxy URI schemes
 _PROXY_SCHEMES = (
@@ -28,17 +30,70 @@ _PROXY_URI_RE = re.compile(
     re.IGNORECASE,
 )
 
+# Standard base64 alphabet plus padding and the line breaks of wrapped blobs
+_B64_ALPHABET = (string.ascii_letters + string.digits + "+/=\r\n\t").encode("ascii")
+
 
 def _is_proxy_line(line: str) -> bool:
     """Check if a line starts with a known proxy URI scheme."""
-    return any(line.startswith(s) for s in _PROXY_SCHEMES)
+    # str.startswith takes the whole tuple in one C-level call
+    return line.startswith(_PROXY_SCHEMES)
 
 
 def _extract_proxy_uris(text: str) -> List[str]:
     """Extract all proxy URIs from text, even if embedded mid-line."""
+    # Every scheme ends in "://"; one substring scan rules out most lines
+    # before the alternation regex is tried at each position
+    if "://" not in text:
+        return []
     return _PROXY_URI_RE.findall(text)
 
 
+def _proxy_records(text: str) -> List[Dict[str, Any]]:
+    """Build deduplicated records for every proxy URI in text, in order.
+
+    The text is NFKC-normalized once up front rather than line by line.
+    Lines that start with a scheme are taken whole (the common case); the
+    rest go through the URI regex.
+    """
+    records = []
+    # Dedup on the line itself; SHA-256 runs only for lines that are kept
+    seen_lines = set()
+    for line in normalize_text(text).splitlines():
+        clean = line.strip()
+        if not clean:
+            continue
+        uris = (clean,) if _is_proxy_line(clean) else _extract_proxy_uris(clean)
+        for uri in uris:
+            stripped = strip_proxy_remark(uri)
+            if stripped not in seen_lines:
+                seen_lines.add(stripped)
+                records.append({"unique_hash": hash_string(stripped), "data": {"line": stripped}})
+    return records
+
+
+def _decode_b64_blob(text: str) -> str:
+    """Return the decoded proxy list if text is a base64 blob, else text unchanged."""
+    # Only try to decode if it looks like base64 (no spaces, no ://)
+    clean_text = text.strip()
+    if "://" not in clean_text and " " not in clean_text and len(clean_text) > 10 and clean_text.isascii():
+        blob = clean_text.encode("ascii")
+        # Deleting every alphabet byte leaves nothing only for a real base64
+        # blob; plain text is rejected here without attempting a decode
+        if blob.translate(None, _B64_ALPHABET):
+            return text
+        try:
+            padding = 4 - len(blob) % 4
+            if padding != 4:
+                blob += b"=" * padding
+            decoded = b64decode(blob).decode("utf-8", errors="ignore")
+            if any(s in decoded for s in _PROXY_SCHEMES):
+                return decoded
+        except (binascii.Error, ValueError):
+            pass  # Not base64 or failed
+    return text
+
+
 def _b64_decode_safe(data: str) -> str:
     """Base64 decode with auto-padding, supports URL-safe variant."""
     data = data.replace("-", "+").replace("_", "/")
@@ -112,48 +167,7 @@ class NpvtHandler(FormatHandler):
 
     def parse(self, raw_data: bytes, source_info: Dict[str, Any]) -> List[Dict[str, Any]]:
         text = raw_data.decode("utf-8", errors="ignore")
-
-        # Try to decode if it looks like base64 (no spaces, no ://)
-        clean_text = text.strip()
-        if "://" not in clean_text and " " not in clean_text and len(clean_text) > 10:
-            try:
-                padding = 4 - len(clean_text) % 4
-                if padding != 4:
-                    clean_text += "=" * padding
-                decoded = base64.b64decode(clean_text).decode("utf-8", errors="ignore")
-                if any(s in decoded for s in _PROXY_SCHEMES):
-                    text = decoded
-            except (binascii.Error, ValueError):
-                pass  # Not base64 or failed
-
-        records = []
-        seen_hashes = set()
-
-        for line in text.splitlines():
-            clean = normalize_text(line)
-            if not clean:
-                continue
-
-            # Fast path: line starts with a proxy scheme (most common case)
-            if _is_proxy_line(clean):
-                stripped = strip_proxy_remark(clean)
-                h = hash_string(stripped)
-                if h not in seen_hashes:
-                    seen_hashes.add(h)
-                    records.append({"unique_hash": h, "data": {"line": stripped}})
-                continue
-
-            # Slow path: extract URIs embedded mid-line
-            uris = _extract_proxy_uris(clean)
-            for uri in uris:
-                uri = uri.strip()
-                stripped = strip_proxy_remark(uri)
-                h = hash_string(stripped)
-                if h not in seen_hashes:
-                    seen_hashes.add(h)
-                    records.append({"unique_hash": h, "data": {"line": stripped}})
-
-        return records
+        return _proxy_records(_decode_b64_blob(text))
 
     def build(self, records: List[Dict[str, Any]]) -> bytes:
         lines = []
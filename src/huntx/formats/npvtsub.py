@@ -1,10 +1,6 @@
 from typing import List, Dict, Any
-import binascii
 from .base import FormatHandler
-from .common.normalize_text import normalize_text
-from .common.hashing import hash_string
-from .npvt import _PROXY_SCHEMES, _is_proxy_line, _extract_proxy_uris, strip_proxy_remark, add_clean_remark
-import base64
+from .npvt import _decode_b64_blob, _proxy_records, strip_proxy_remark, add_clean_remark
 
 
 class NpvtSubHandler(FormatHandler):
@@ -21,66 +17,25 @@ class NpvtSubHandler(FormatHandler):
 
     def parse(self, raw_data: bytes, source_info: Dict[str, Any]) -> List[Dict[str, Any]]:
         text = raw_data.decode("utf-8", errors="ignore")
-
-        # Try base64 decode if it doesn't look like plain URIs
-        clean_text = text.strip()
-        if "://" not in clean_text and " " not in clean_text and len(clean_text) > 10:
-            try:
-                padding = 4 - len(clean_text) % 4
-                if padding != 4:
-                    clean_text += "=" * padding
-                decoded = base64.b64decode(clean_text).decode("utf-8", errors="ignore")
-                if any(s in decoded for s in _PROXY_SCHEMES):
-                    text = decoded
-            except (binascii.Error, ValueError):
-                pass
-
-        records = []
-        seen_hashes = set()
-
-        for line in text.splitlines():
-            clean = normalize_text(line)
-            if not clean:
-                continue
-
-            # Fast path: line starts with a proxy scheme
-            if _is_proxy_line(clean):
-                stripped = strip_proxy_remark(clean)
-                h = hash_string(stripped)
-                if h not in seen_hashes:
-                    seen_hashes.add(h)
-                    records.append({"unique_hash": h, "data": {"line": stripped}})
-                continue
-
-            # Slow path: extract URIs embedded mid-line
-            uris = _extract_proxy_uris(clean)
-            for uri in uris:
-                uri = uri.strip()
-                stripped = strip_proxy_remark(uri)
-                h = hash_string(stripped)
-                if h not in seen_hashes:
-                    seen_hashes.add(h)
-                    records.append({"unique_hash": h, "data": {"line": stripped}})
-
-        return records
+        return _proxy_records(_decode_b64_blob(text))
 
     def build(self, records: List[Dict[str, Any]]) -> bytes:
-        lines = []
-        seen: set = set()
+        def stripped_lines():
+            for r in records:
+                line = None
+                if isinstance(r, dict):
+                    data = r.get("data")
+                    if isinstance(data, dict):
+                        line = data.get("line")
+                    elif isinstance(r.get("line"), str):
+                        line = r["line"]
+                if line:
+                    yield strip_proxy_remark(line)
+
+        # dict.fromkeys dedups in C and keeps first-seen order
         remark_counter: dict = {}
-        for r in records:
-            line = None
-            if isinstance(r, dict):
-                data = r.get("data")
-                if isinstance(data, dict):
-                    line = data.get("line")
-                elif isinstance(r.get("line"), str):
-                    line = r["line"]
-            if not line:
-                continue
-            stripped = strip_proxy_remark(line)
-            if stripped not in seen:
-                seen.add(stripped)
-                lines.append(add_clean_remark(stripped, remark_counter))
-        content = "\n".join(lines)
+        content = "\n".join(
+            add_clean_remark(stripped, remark_counter)
+            for stripped in dict.fromkeys(stripped_lines())
+        )
         return content.encode("utf-8")
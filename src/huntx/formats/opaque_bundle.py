@@ -1,5 +1,6 @@
 import logging
 import zipfile
+import zlib
 import io
 from typing import List, Dict, Any
 from .base import FormatHandler
@@ -8,6 +9,19 @@ from ..store.raw_store import RawStore
 
 logger = logging.getLogger(__name__)
 
+# Bytes sampled from each blob to decide whether DEFLATE is worth running
+_COMPRESS_SAMPLE = 4096
+
+
+def _compress_type(content: bytes) -> int:
+    """ZIP_STORED for blobs that are already compressed or encrypted, else ZIP_DEFLATED."""
+    sample = content[:_COMPRESS_SAMPLE]
+    # A fast level-1 pass over the sample saving under 10% means the full
+    # blob would burn CPU in DEFLATE for next to nothing
+    if len(zlib.compress(sample, 1)) > len(sample) * 0.9:
+        return zipfile.ZIP_STORED
+    return zipfile.ZIP_DEFLATED
+
 
 class OpaqueBundleHandler(FormatHandler):
     def __init__(self, raw_store: RawStore, format_name: str = "opaque_bundle"):
@@ -19,7 +33,9 @@ class OpaqueBundleHandler(FormatHandler):
         return self._format_name
 
     def parse(self, raw_data: bytes, source_info: Dict[str, Any]) -> List[Dict[str, Any]]:
-        raw_hash = hash_bytes(raw_data)
+        # The transform step passes the RawStore key, which is already the
+        # SHA-256 of raw_data; only hash when called without it
+        raw_hash = source_info.get("raw_hash") or hash_bytes(raw_data)
         filename = source_info.get("filename", f"{raw_hash}.bin")
 
         record = {
@@ -57,6 +73,6 @@ class OpaqueBundleHandler(FormatHandler):
                     counter += 1
                 seen_names.add(name)
 
-                zf.writestr(name, content)
+                zf.writestr(name, content, compress_type=_compress_type(content))
 
         return buffer.getvalue()
@@ -7,12 +7,13 @@ logger = logging.getLogger(__name__)
 
 class FormatRegistry:
     _instance = None
-    _handlers: Dict[str, FormatHandler] = {}
+    _handlers: Dict[str, FormatHandler]
 
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(FormatRegistry, cls).__new__(cls)
-            cls._handlers = {}
+            # Owned by the singleton instance, not shared through the class
+            cls._instance._handlers = {}
         return cls._instance
 
     @classmethod
@@ -30,7 +31,7 @@ class FormatRegistry:
 
     def get(self, format_id: str) -> Optional[FormatHandler]:
         handler = self._handlers.get(format_id)
-        if not handler:
+        if handler is None:
             logger.warning(f"Requested unknown format: {format_id}")
             return None
         return handler
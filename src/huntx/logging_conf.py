@@ -1,7 +1,10 @@
 import logging
 import sys
 from logging.handlers import RotatingFileHandler
-from typing import Optional
+from typing import Optional, Tuple
+
+# (log_level, log_file) of the configuration currently installed by setup_logging
+_configured: Optional[Tuple[int, Optional[str]]] = None
 
 
 def setup_logging(log_level: int = logging.INFO, log_file: Optional[str] = None):
@@ -12,12 +15,21 @@ def setup_logging(log_level: int = logging.INFO, log_file: Optional[str] = None)
         log_level: The logging level (e.g., logging.INFO, logging.DEBUG).
         log_file: Optional path to a file where logs should be written.
     """
+    global _configured
+
     root_logger = logging.getLogger()
+
+    # Repeat calls with the same settings are no-ops, so the file handler is not
+    # reopened on every run_command invocation in the same process.
+    if _configured == (log_level, log_file) and root_logger.handlers:
+        return
+
     root_logger.setLevel(log_level)
 
     # Clear existing handlers to prevent duplication
-    if root_logger.handlers:
-        root_logger.handlers = []
+    for handler in root_logger.handlers[:]:
+        root_logger.removeHandler(handler)
+        handler.close()
 
     # Detailed formatter
     # Including threadName, module, pathname for maximum context
@@ -49,3 +61,5 @@ def setup_logging(log_level: int = logging.INFO, log_file: Optional[str] = None)
     logging.getLogger("urllib3").setLevel(logging.WARNING)
     logging.getLogger("telethon").setLevel(logging.WARNING)
     logging.getLogger("asyncio").setLevel(logging.WARNING)
+
+    _configured = (log_level, log_file)
@@ -1,5 +1,4 @@
 import base64
-import json
 import logging
 import time
 from typing import List, Dict, Any, Optional
@@ -7,6 +6,8 @@ from urllib.parse import urlparse, parse_qs, unquote
 from ..state.repo import StateRepo
 from ..store.artifact_store import ArtifactStore
 from ..formats.registry import FormatRegistry
+from ..utils.b64fast import b64decode
+from ..utils.jsonfast import dumps_bytes, loads as json_loads
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +25,18 @@ _PROXY_SCHEMES = (
     "dns://", "dnstt://",
 )
 
+# Scheme (text before "://") -> protocol name for URIs parsed with urlparse
+_STANDARD_PROTOS = {
+    "vless": "vless", "trojan": "trojan",
+    "hysteria2": "hysteria2", "hy2": "hysteria2", "hysteria": "hysteria",
+    "tuic": "tuic",
+    "wireguard": "wireguard", "wg": "wireguard",
+    "socks": "socks", "socks5": "socks5", "socks4": "socks4",
+    "anytls": "anytls", "juicity": "juicity",
+    "warp": "warp",
+    "dns": "dns", "dnstt": "dnstt",
+}
+
 
 class BuildPipeline:
     def __init__(self, state_repo: StateRepo, artifact_store: ArtifactStore, registry: FormatRegistry):
@@ -42,7 +55,7 @@ class BuildPipeline:
         padding = 4 - len(data) % 4
         if padding != 4:
             data += "=" * padding
-        return base64.b64decode(data).decode("utf-8", errors="ignore")
+        return b64decode(data).decode("utf-8", errors="ignore")
 
     @staticmethod
     def _parse_standard_uri(line: str, protocol: str) -> Dict[str, Any]:
@@ -72,7 +85,7 @@ class BuildPipeline:
         try:
             b64 = line[8:]
             raw = BuildPipeline._b64_decode(b64)
-            obj = json.loads(raw)
+            obj = json_loads(raw)
             return {"protocol": "vmess", "decoded": obj, "raw": line}
         except Exception:
             return {"protocol": "vmess", "raw": line, "error": "decode_failed"}
@@ -152,29 +165,23 @@ class BuildPipeline:
 
     def _decode_single_line(self, line: str) -> Optional[Dict[str, Any]]:
         """Decode a single proxy URI line into structured JSON."""
-        if line.startswith("vmess://"):
+        # One split and one dict lookup instead of a startswith per scheme
+        scheme, sep, _ = line.partition("://")
+        if not sep:
+            return None
+        if scheme == "vmess":
             return self._decode_vmess(line)
-        if line.startswith("ss://") and not line.startswith("ssr://"):
+        if scheme == "ss":
             return self._decode_ss(line)
-        if line.startswith("ssr://"):
+        if scheme == "ssr":
             return self._decode_ssr(line)
 
         # Standard URI protocols — parse with urlparse
-        _STANDARD_PROTOS = {
-            "vless://": "vless", "trojan://": "trojan",
-            "hysteria2://": "hysteria2", "hy2://": "hysteria2", "hysteria://": "hysteria",
-            "tuic://": "tuic",
-            "wireguard://": "wireguard", "wg://": "wireguard",
-            "socks://": "socks", "socks5://": "socks5", "socks4://": "socks4",
-            "anytls://": "anytls", "juicity://": "juicity",
-            "warp://": "warp",
-            "dns://": "dns", "dnstt://": "dnstt",
-        }
-        for prefix, proto in _STANDARD_PROTOS.items():
-            if line.startswith(prefix):
-                result = self._parse_standard_uri(line, proto)
-                result["raw"] = line
-                return result
+        proto = _STANDARD_PROTOS.get(scheme)
+        if proto is not None:
+            result = self._parse_standard_uri(line, proto)
+            result["raw"] = line
+            return result
         return None
 
     def _decode_proxy_links(self, artifact_bytes: bytes) -> bytes:
@@ -205,7 +212,7 @@ class BuildPipeline:
             "protocols": protocols,
             "entries": decoded_entries,
         }
-        return json.dumps(result, indent=2, ensure_ascii=False).encode("utf-8")
+        return dumps_bytes(result, indent=True)
 
     @staticmethod
     def _reencode_as_base64_sub(artifact_bytes: bytes) -> bytes:
@@ -243,11 +250,11 @@ class BuildPipeline:
         fetch_duration = time.time() - fetch_start
         record_count = len(records)
 
-        # Count records per format type for diagnostics
-        type_counts = {}
+        # Group records by format type in one pass; the counts are for diagnostics
+        records_by_type: Dict[str, List[Dict[str, Any]]] = {}
         for r in records:
-            rt = r.get("record_type", "?")
-            type_counts[rt] = type_counts.get(rt, 0) + 1
+            records_by_type.setdefault(r.get("record_type", "?"), []).append(r)
+        type_counts = {rt: len(rs) for rt, rs in records_by_type.items()}
 
         logger.info(
             f"[Build] Fetched {record_count} records in {fetch_duration:.2f}s "
@@ -270,8 +277,8 @@ class BuildPipeline:
                     logger.error(f"[Build] No handler for format={fmt}, skipping.")
                     continue
 
-                # Filter records to only those matching this format's record_type
-                fmt_records = [r for r in records if r.get("record_type") == fmt]
+                # Only the records matching this format's record_type
+                fmt_records = records_by_type.get(fmt)
                 if not fmt_records:
                     empty_formats.append(fmt)
                     logger.debug(f"[Build] No records of type '{fmt}' for route '{route_name}'")
@@ -84,7 +84,7 @@ class TransformPipeline:
 
             # Parse
             try:
-                records = handler.parse(data, {"filename": filename, "source_id": source_id})
+                records = handler.parse(data, {"filename": filename, "source_id": source_id, "raw_hash": raw_hash})
             except Exception as e:
                 logger.warning(f"[Transform] Parse error file={filename} fmt={fmt_id}: {e}")
                 result["status"] = "failed"
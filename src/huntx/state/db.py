@@ -6,6 +6,16 @@ from typing import Generator
 
 logger = logging.getLogger(__name__)
 
+# Per-connection tuning; connect() opens a fresh connection each time, so these
+# are applied on every open. journal_mode=WAL is persistent and set once in _init_db.
+_CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL;",
+    "PRAGMA temp_store=MEMORY;",
+    "PRAGMA mmap_size=268435456;",
+    "PRAGMA cache_size=-65536;",
+    "PRAGMA wal_autocheckpoint=1000;",
+)
+
 
 class DBConnection:
     def __init__(self, db_path: Path):
@@ -23,7 +33,6 @@ class DBConnection:
         with self.connect() as conn:
             # Enable WAL
             conn.execute("PRAGMA journal_mode=WAL;")
-            conn.execute("PRAGMA synchronous=NORMAL;")
 
             # Run basic schema
             try:
@@ -55,6 +64,8 @@ class DBConnection:
         # Increase timeout to handle concurrent writes better (default is 5.0)
         conn = sqlite3.connect(str(self.db_path), timeout=30.0)
         conn.row_factory = sqlite3.Row
+        for pragma in _CONNECTION_PRAGMAS:
+            conn.execute(pragma)
         try:
             yield conn
             conn.commit()
@@ -29,6 +29,29 @@ class StateRepo:
             logger.error(f"Failed to get source state for {source_id}: {e}")
             return None
 
+    def get_source_states(
+        self,
+        source_ids: List[str],
+        conn: Optional[sqlite3.Connection] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """Fetch the state of several sources in one query. Sources without state are omitted."""
+        if not source_ids:
+            return {}
+
+        try:
+            placeholders = ",".join("?" for _ in source_ids)
+            query = f"SELECT source_id, state_json FROM source_state WHERE source_id IN ({placeholders})"
+
+            if conn:
+                cursor = conn.execute(query, list(source_ids))
+                return {row["source_id"]: json.loads(row["state_json"]) for row in cursor.fetchall()}
+            else:
+                with self.db.connect() as c:
+                    return self.get_source_states(source_ids, c)
+        except Exception as e:
+            logger.error(f"Failed to get source states for {len(source_ids)} sources: {e}")
+            return {}
+
     def update_source_state(
         self,
         source_id: str,
@@ -206,6 +229,43 @@ class StateRepo:
         except Exception as e:
             logger.error(f"Failed to batch-update file statuses: {e}")
 
+    @staticmethod
+    def _records_for_build_query(
+        columns: str,
+        record_types: List[str],
+        allowed_source_ids: List[str],
+        min_seen_file_id: Optional[int] = None,
+    ):
+        placeholders_types = ",".join("?" for _ in record_types)
+        placeholders_sources = ",".join("?" for _ in allowed_source_ids)
+        where_extra = ""
+        args: List[Any] = list(record_types) + list(allowed_source_ids)
+        if min_seen_file_id is not None:
+            where_extra = " AND s.id > ?"
+            args.append(int(min_seen_file_id))
+
+        query = f"""
+            WITH filtered AS (
+                SELECT r.id, r.record_type, r.unique_hash, r.data_json
+                FROM records r
+                JOIN seen_files s ON r.source_file_hash = s.raw_hash
+                WHERE r.record_type IN ({placeholders_types})
+                  AND s.source_id IN ({placeholders_sources})
+                  AND r.is_active = 1
+                  {where_extra}
+            ),
+            dedup AS (
+                SELECT record_type, unique_hash, MAX(id) AS keep_id
+                FROM filtered
+                GROUP BY record_type, unique_hash
+            )
+            SELECT {columns}
+            FROM filtered f
+            JOIN dedup d ON d.keep_id = f.id
+            ORDER BY f.id ASC
+        """
+        return query, args
+
     def get_records_for_build(
         self,
         record_types: List[str],
@@ -216,35 +276,9 @@ class StateRepo:
             return []
 
         try:
-            placeholders_types = ",".join("?" for _ in record_types)
-            placeholders_sources = ",".join("?" for _ in allowed_source_ids)
-            where_extra = ""
-            args: List[Any] = list(record_types) + list(allowed_source_ids)
-            if min_seen_file_id is not None:
-                where_extra = " AND s.id > ?"
-                args.append(int(min_seen_file_id))
-
-            query = f"""
-                WITH filtered AS (
-                    SELECT r.id, r.record_type, r.unique_hash, r.data_json
-                    FROM records r
-                    JOIN seen_files s ON r.source_file_hash = s.raw_hash
-                    WHERE r.record_type IN ({placeholders_types})
-                      AND s.source_id IN ({placeholders_sources})
-                      AND r.is_active = 1
-                      {where_extra}
-                ),
-                dedup AS (
-                    SELECT record_type, unique_hash, MAX(id) AS keep_id
-                    FROM filtered
-                    GROUP BY record_type, unique_hash
-                )
-                SELECT f.record_type, f.data_json
-                FROM filtered f
-                JOIN dedup d ON d.keep_id = f.id
-                ORDER BY f.id ASC
-            """
-
+            query, args = self._records_for_build_query(
+                "f.record_type, f.data_json", record_types, allowed_source_ids, min_seen_file_id
+            )
             with self.db.connect() as conn:
                 cursor = conn.execute(query, args)
                 return [
@@ -255,6 +289,40 @@ class StateRepo:
             logger.error(f"Failed to get records for build (types={record_types}): {e}")
             return []
 
+    def get_record_lines_for_build(self, record_types: List[str], allowed_source_ids: List[str]) -> List[str]:
+        """
+        Like get_records_for_build, but returns only each record's "line" field.
+        The field is projected with SQLite's json_extract so callers that only
+        need the line skip decoding every data_json blob in Python.
+        """
+        if not record_types or not allowed_source_ids:
+            return []
+
+        try:
+            query, args = self._records_for_build_query(
+                "json_extract(f.data_json, '$.line') AS line", record_types, allowed_source_ids
+            )
+            with self.db.connect() as conn:
+                rows = conn.execute(query, args).fetchall()
+            return [row["line"] for row in rows if isinstance(row["line"], str)]
+        except sqlite3.OperationalError as e:
+            # Only a SQLite built without JSON1 falls back; a locked database
+            # or malformed JSON is a real failure.
+            if "no such function: json_extract" not in str(e):
+                logger.error(f"Failed to get record lines for build (types={record_types}): {e}")
+                return []
+            logger.debug(f"json_extract unavailable, falling back to Python decode: {e}")
+            records = self.get_records_for_build(record_types, allowed_source_ids)
+            lines = []
+            for rec in records:
+                data = rec.get("data")
+                if isinstance(data, dict) and isinstance(data.get("line"), str):
+                    lines.append(data["line"])
+            return lines
+        except Exception as e:
+            logger.error(f"Failed to get record lines for build (types={record_types}): {e}")
+            return []
+
     def is_artifact_published(self, route_name: str, artifact_hash: str) -> bool:
         try:
             with self.db.connect() as conn:
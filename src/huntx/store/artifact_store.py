@@ -1,5 +1,6 @@
 import hashlib
 import logging
+import os
 import time
 from pathlib import Path
 from ..utils.atomic import atomic_write
@@ -100,14 +101,20 @@ class ArtifactStore:
         """
         now = time.time()
         cutoff = now - (days * 86400)
-        files = []
+        entries = []
         try:
-            for item in self.archive_dir.iterdir():
-                if item.is_file() and item.stat().st_mtime >= cutoff:
-                    files.append(item)
+            # scandir caches the file type and stat per entry, so each file
+            # is stat'ed once instead of again inside the sort key.
+            with os.scandir(self.archive_dir) as it:
+                for entry in it:
+                    if not entry.is_file():
+                        continue
+                    mtime = entry.stat().st_mtime
+                    if mtime >= cutoff:
+                        entries.append((mtime, Path(entry.path)))
             # Sort by time desc
-            files.sort(key=lambda x: x.stat().st_mtime, reverse=True)
-            return files
+            entries.sort(key=lambda x: x[0], reverse=True)
+            return [path for _, path in entries]
         except Exception as e:
             logger.error(f"Failed to list archive: {e}")
             return []
@@ -74,10 +74,12 @@ class RawStore:
             processed_hashes = state_repo.get_processed_hashes()
             for h in processed_hashes:
                 prefix = h[:2]
-                path = self.base_dir / prefix / h
-                if path.exists():
-                    path.unlink()
-                    pruned += 1
+                # One unlink syscall per hash; most processed blobs are already gone
+                try:
+                    (self.base_dir / prefix / h).unlink()
+                except FileNotFoundError:
+                    continue
+                pruned += 1
             if pruned:
                 logger.info(f"Pruned {pruned} processed raw blobs.")
             # Remove empty shard directories
@@ -0,0 +1,14 @@
+"""Base64 helpers that use pybase64 when installed and fall back to the stdlib."""
+import base64
+
+try:
+    import pybase64
+except ImportError:  # pragma: no cover - optional dependency
+    pybase64 = None
+
+
+def b64decode(data: "bytes | str") -> bytes:
+    """Decode standard base64, discarding characters outside the alphabet."""
+    if pybase64 is not None:
+        return pybase64.b64decode(data, validate=False)
+    return base64.b64decode(data)
@@ -10,6 +10,7 @@ class TestApkSkipping(unittest.TestCase):
         # Clear shared state to prevent test pollution
         if hasattr(TelegramConnector, "_shared_state"):
             TelegramConnector._shared_state = {}
+            TelegramConnector._file_paths.clear()
         # Clear local state for TelegramUserConnector
         if hasattr(TelegramUserConnector._local, "clients"):
             TelegramUserConnector._local.clients = {}
@@ -44,7 +45,7 @@ class TestApkSkipping(unittest.TestCase):
                         }
                     ],
                 },
-                {"ok": True, "result": []},  # End updates loop
+                {"ok": True, "result": []},  # Offset acknowledgement
                 {"ok": True, "result": {"file_path": "path/apk"}},  # getFile - Should NOT be called if skipped
             ]
             mock_download.return_value = b"apk_content"
@@ -54,11 +55,13 @@ class TestApkSkipping(unittest.TestCase):
             self.assertEqual(len(items), 0)
 
             # Verify getFile was NOT called.
-            # mock_request.call_args_list should show only getUpdates
+            # mock_request.call_args_list should show only getUpdates: the poll
+            # and the acknowledgement of the drained page.
             calls = mock_request.call_args_list
             self.assertEqual(len(calls), 2)
             self.assertEqual(calls[0][0][0], "getUpdates")
             self.assertEqual(calls[1][0][0], "getUpdates")
+            self.assertEqual(calls[1][0][1]["offset"], 2)
 
     def test_telegram_connector_mixed_content(self):
         connector = TelegramConnector("token", "123")
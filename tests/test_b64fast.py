@@ -0,0 +1,28 @@
+import base64
+import binascii
+import unittest
+from unittest.mock import patch
+
+from huntx.utils import b64fast
+
+
+class TestB64Fast(unittest.TestCase):
+    PLAIN = b"vless://a@b:1\ntrojan://c@d:2"
+
+    def test_round_trip(self):
+        encoded = base64.b64encode(self.PLAIN)
+        self.assertEqual(b64fast.b64decode(encoded), self.PLAIN)
+        self.assertEqual(b64fast.b64decode(encoded.decode("ascii")), self.PLAIN)
+
+    def test_stdlib_fallback(self):
+        encoded = base64.b64encode(self.PLAIN)
+        with patch.object(b64fast, "pybase64", None):
+            self.assertEqual(b64fast.b64decode(encoded), self.PLAIN)
+            # Characters outside the alphabet are discarded, not rejected
+            self.assertEqual(b64fast.b64decode(b"dm xl\nc3M="), b"vless")
+            with self.assertRaises(binascii.Error):
+                b64fast.b64decode(b"dmxlc3")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -11,6 +11,7 @@ class TestBotConnectorCoverage(unittest.TestCase):
         self.chat_id = "123456"
         self.connector = TelegramConnector(self.token, self.chat_id)
         TelegramConnector._shared_state = {}
+        TelegramConnector._file_paths.clear()
 
     def _create_mock_response(self, content):
         m = MagicMock()
@@ -19,7 +20,7 @@ class TestBotConnectorCoverage(unittest.TestCase):
         m.read.return_value = content
         return m
 
-    @patch("urllib.request.urlopen")
+    @patch("huntx.connectors.telegram.connector._BotApiSession.open")
     def test_make_request_retry_success(self, mock_urlopen):
         # Fail twice, then succeed
         mock_error = urllib.error.URLError("Network unreachable")
@@ -32,7 +33,7 @@ class TestBotConnectorCoverage(unittest.TestCase):
         self.assertTrue(res["ok"])
         self.assertEqual(mock_urlopen.call_count, 3)
 
-    @patch("urllib.request.urlopen")
+    @patch("huntx.connectors.telegram.connector._BotApiSession.open")
     def test_make_request_retry_failure(self, mock_urlopen):
         mock_error = urllib.error.URLError("Network unreachable")
         mock_urlopen.side_effect = mock_error
@@ -41,7 +42,7 @@ class TestBotConnectorCoverage(unittest.TestCase):
         self.assertFalse(res["ok"])
         self.assertEqual(mock_urlopen.call_count, 7)
 
-    @patch("urllib.request.urlopen")
+    @patch("huntx.connectors.telegram.connector._BotApiSession.open")
     def test_download_file_retry(self, mock_urlopen):
         mock_error = urllib.error.URLError("Fail")
         mock_success = self._create_mock_response(b"filedata")
@@ -52,7 +53,7 @@ class TestBotConnectorCoverage(unittest.TestCase):
         self.assertEqual(data, b"filedata")
         self.assertEqual(mock_urlopen.call_count, 2)
 
-    @patch("urllib.request.urlopen")
+    @patch("huntx.connectors.telegram.connector._BotApiSession.open")
     def test_download_file_fail(self, mock_urlopen):
         mock_urlopen.side_effect = Exception("Fatal")
         data = self.connector._download_file("path")
@@ -86,6 +87,176 @@ class TestBotConnectorCoverage(unittest.TestCase):
                 self.assertEqual(len(items), 1)
                 self.assertEqual(items[0].external_id, "100")
 
+    def _doc_update(self, update_id, text=None):
+        msg = {
+            "message_id": update_id * 10,
+            "chat": {"id": 123456},
+            "date": 2000000000,
+            "document": {"file_id": f"f{update_id}", "file_name": f"{update_id}.txt", "file_size": 100},
+        }
+        if text:
+            msg["caption"] = text
+        return {"update_id": update_id, "message": msg}
+
+    def _fake_request(self, updates):
+        pages = [updates, []]
+
+        def fake(method, params=None):
+            if method == "getUpdates":
+                return {"ok": True, "result": pages.pop(0) if pages else []}
+            return {"ok": True, "result": {"file_path": params["file_id"]}}
+        return fake
+
+    def test_list_new_prefetch_keeps_update_order(self):
+        updates = [self._doc_update(i, text="vless://x" if i == 3 else None) for i in range(1, 8)]
+        with patch("time.sleep"), \
+                patch.object(self.connector, "_make_request", side_effect=self._fake_request(updates)), \
+                patch.object(self.connector, "_download_file", side_effect=lambda path: path.encode()):
+            items = list(self.connector.list_new())
+
+        self.assertEqual(
+            [i.external_id for i in items],
+            ["10", "20", "30_text", "30", "40", "50", "60", "70"],
+        )
+        self.assertEqual(items[3].data, b"f3")
+        self.assertEqual(self.connector.get_state(), {"offset": 7})
+
+    def test_list_new_offset_stops_at_last_consumed(self):
+        updates = [self._doc_update(i) for i in range(1, 6)]
+        with patch("time.sleep"), \
+                patch.object(self.connector, "_make_request", side_effect=self._fake_request(updates)), \
+                patch.object(self.connector, "_download_file", side_effect=lambda path: path.encode()):
+            gen = self.connector.list_new()
+            next(gen)
+            next(gen)
+            gen.close()
+
+        self.assertEqual(self.connector.get_state(), {"offset": 2})
+
+    def test_cached_updates_below_offset_are_skipped(self):
+        updates = [self._doc_update(i) for i in range(1, 6)]
+        with patch("time.sleep"), \
+                patch.object(self.connector, "_make_request", side_effect=self._fake_request(updates)), \
+                patch.object(self.connector, "_download_file", side_effect=lambda path: path.encode()):
+            list(self.connector.list_new())
+            # A second source on the same bot resumes from its own offset
+            other = TelegramConnector(self.token, self.chat_id)
+            with patch.object(other, "_make_request", side_effect=self._fake_request([])), \
+                    patch.object(other, "_download_file", side_effect=lambda path: path.encode()):
+                items = list(other.list_new({"offset": 3}))
+
+        self.assertEqual([i.external_id for i in items], ["40", "50"])
+
+    def test_update_cache_is_bounded(self):
+        updates = [self._doc_update(i) for i in range(1, 8)]
+        with patch("huntx.connectors.telegram.connector._MAX_CACHED_UPDATES", 5), \
+                patch("time.sleep"), \
+                patch.object(self.connector, "_make_request", side_effect=self._fake_request(updates)), \
+                patch.object(self.connector, "_download_file", side_effect=lambda path: path.encode()):
+            items = list(self.connector.list_new())
+
+        # Nothing is evicted before the source has processed it
+        self.assertEqual([i.external_id for i in items], ["10", "20", "30", "40", "50", "60", "70"])
+        cache = TelegramConnector._shared_state[self.token].updates
+        self.assertEqual(list(cache), [3, 4, 5, 6, 7])
+
+    def test_update_cache_keeps_updates_another_source_has_not_consumed(self):
+        updates = [self._doc_update(i) for i in range(1, 8)]
+        with patch("huntx.connectors.telegram.connector._MAX_CACHED_UPDATES", 5), \
+                patch("time.sleep"), \
+                patch.object(self.connector, "_make_request", side_effect=self._fake_request(updates)), \
+                patch.object(self.connector, "_download_file", side_effect=lambda path: path.encode()):
+            list(self.connector.list_new())
+            shared = TelegramConnector._shared_state[self.token]
+            self.assertEqual(list(shared.updates), [3, 4, 5, 6, 7])
+
+            # A second source on the bot pins the cache at its offset
+            shared.consumed["-100999"] = 4
+            shared.updates.update({i: self._doc_update(i) for i in range(8, 12)})
+            self.connector._trim_cache(shared)
+
+        self.assertEqual(list(shared.updates), [5, 6, 7, 8, 9, 10, 11])
+
+    def test_oversized_document_skipped_without_get_file(self):
+        update = self._doc_update(1)
+        update["message"]["document"]["file_size"] = 21 * 1024 * 1024
+        fake = MagicMock(side_effect=self._fake_request([update]))
+        with patch("time.sleep"), patch.object(self.connector, "_make_request", fake):
+            items = list(self.connector.list_new())
+
+        self.assertEqual(items, [])
+        self.assertNotIn("getFile", [c.args[0] for c in fake.call_args_list])
+
+    def test_media_mime_documents_skipped_without_get_file(self):
+        video = self._doc_update(1)
+        video["message"]["document"]["mime_type"] = "video/mp4"
+        iso = self._doc_update(2)
+        iso["message"]["document"]["mime_type"] = "application/x-iso9660-image"
+        conf = self._doc_update(3)
+        conf["message"]["document"]["mime_type"] = "text/plain"
+        fake = MagicMock(side_effect=self._fake_request([video, iso, conf]))
+        with patch("time.sleep"), \
+                patch.object(self.connector, "_make_request", fake), \
+                patch.object(self.connector, "_download_file", side_effect=lambda path: path.encode()):
+            items = list(self.connector.list_new())
+
+        self.assertEqual([i.external_id for i in items], ["30"])
+        file_ids = [c.args[1]["file_id"] for c in fake.call_args_list if c.args[0] == "getFile"]
+        self.assertEqual(file_ids, ["f3"])
+
+    def test_file_path_reused_and_refreshed_on_failed_download(self):
+        fake = MagicMock(side_effect=lambda method, params=None: {"ok": True, "result": {"file_path": "p/new"}})
+        self.connector._remember_file_path("f1", "p/old")
+        downloads = {"p/old": None, "p/new": b"data"}
+        with patch.object(self.connector, "_make_request", fake), \
+                patch.object(self.connector, "_download_file", side_effect=downloads.get):
+            self.assertEqual(self.connector._fetch_document("f1"), b"data")
+            self.assertEqual(self.connector._fetch_document("f1"), b"data")
+
+        # The stale path cost one getFile; the refreshed one is then reused
+        self.assertEqual(fake.call_count, 1)
+        self.assertEqual(self.connector._cached_file_path("f1"), "p/new")
+
+    def test_long_poll_stops_after_short_page(self):
+        updates = [self._doc_update(i) for i in range(1, 4)]
+        fake = MagicMock(side_effect=self._fake_request(updates))
+        with patch("time.sleep") as mock_sleep, \
+                patch.object(self.connector, "_make_request", fake), \
+                patch.object(self.connector, "_download_file", side_effect=lambda path: path.encode()):
+            list(self.connector.list_new())
+
+        polls = [c.args[1] for c in fake.call_args_list if c.args[0] == "getUpdates"]
+        # One non-blocking poll, then an acknowledgement of the drained page
+        self.assertEqual([p["timeout"] for p in polls], [0, 0])
+        self.assertEqual(polls[1]["offset"], 4)
+        mock_sleep.assert_not_called()
+
+    def test_poll_timeout_from_fetch_windows(self):
+        connector = TelegramConnector(self.token, self.chat_id, fetch_windows={"poll_timeout": 50})
+        fake = MagicMock(side_effect=self._fake_request([self._doc_update(1)]))
+        with patch.object(connector, "_make_request", fake), \
+                patch.object(connector, "_download_file", side_effect=lambda path: path.encode()):
+            list(connector.list_new())
+
+        polls = [c.args[1] for c in fake.call_args_list if c.args[0] == "getUpdates"]
+        # The configured long poll applies to the fetch; the ack never blocks
+        self.assertEqual([p["timeout"] for p in polls], [50, 0])
+
+    def test_malformed_and_media_updates_are_skipped(self):
+        no_chat = self._doc_update(1)
+        del no_chat["message"]["chat"]
+        photo = self._doc_update(2)
+        photo["message"]["photo"] = [{"file_id": "p"}]
+        empty_photo = self._doc_update(3)
+        empty_photo["message"]["photo"] = []
+        with patch("time.sleep"), \
+                patch.object(self.connector, "_make_request",
+                             side_effect=self._fake_request([no_chat, photo, empty_photo])), \
+                patch.object(self.connector, "_download_file", side_effect=lambda path: path.encode()):
+            items = list(self.connector.list_new())
+
+        self.assertEqual([i.external_id for i in items], ["30"])
+
 
 if __name__ == "__main__":
     unittest.main()
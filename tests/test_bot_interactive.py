@@ -1,11 +1,18 @@
+import asyncio
+import tempfile
 import unittest
 import sqlite3
 import time
+from pathlib import Path
+from unittest.mock import AsyncMock
 from huntx.bot.interactive import (
     InteractiveBot,
     WELCOME_TEXT,
     SUPPORTED_FORMATS,
     _BOT_COMMANDS,
+    _COMMAND_RE,
+    _ALL_VALID_FORMATS,
+    _FORMATS_TEXT,
 )
 
 
@@ -158,6 +165,63 @@ class TestBotUserRegistration(unittest.TestCase):
         self.assertEqual(total, 4)
         self.assertEqual(active, 3)
 
+    def _bot(self):
+        bot = InteractiveBot.__new__(InteractiveBot)
+        bot.db = FakeDB(self.conn)
+        return bot
+
+    def test_get_user_count_single_query(self):
+        now = time.time()
+        for uid, muted in [("1", 0), ("2", 1), ("3", 0)]:
+            self.conn.execute(
+                "INSERT INTO bot_users (user_id, chat_id, username, registered_at, muted) VALUES (?, ?, ?, ?, ?)",
+                (uid, uid + "0", f"u{uid}", now, muted),
+            )
+        self.conn.commit()
+        self.assertEqual(self._bot()._get_user_count(), {"total": 3, "active": 2, "muted": 1})
+
+    def test_get_user_count_empty(self):
+        self.assertEqual(self._bot()._get_user_count(), {"total": 0, "active": 0, "muted": 0})
+
+    def test_mark_delivered_batch(self):
+        now = time.time()
+        for uid in ("1", "2", "3"):
+            self.conn.execute(
+                "INSERT INTO bot_users (user_id, chat_id, username, registered_at) VALUES (?, ?, ?, ?)",
+                (uid, uid, None, now),
+            )
+        self.conn.commit()
+        self._bot()._mark_delivered(["1", "3"], 123.0)
+        rows = self.conn.execute("SELECT user_id, last_delivered_at FROM bot_users ORDER BY user_id").fetchall()
+        self.assertEqual([(r["user_id"], r["last_delivered_at"]) for r in rows],
+                         [("1", 123.0), ("2", 0), ("3", 123.0)])
+
+
+class TestBotCommandRegistration(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.bot = InteractiveBot.__new__(InteractiveBot)
+        self.bot.token = "123:ABC"
+        self.bot.client = AsyncMock()
+        self.bot._commands_hash_path = Path(self.tmp.name) / "bot_commands.hash"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_menu_registered_once_per_token(self):
+        asyncio.run(self.bot._register_commands())
+        asyncio.run(self.bot._register_commands())
+        self.assertEqual(self.bot.client.await_count, 1)
+
+        self.bot.token = "456:DEF"
+        asyncio.run(self.bot._register_commands())
+        self.assertEqual(self.bot.client.await_count, 2)
+
+    def test_failed_registration_is_retried(self):
+        self.bot.client.side_effect = RuntimeError("flood")
+        asyncio.run(self.bot._register_commands())
+        self.assertFalse(self.bot._commands_hash_path.exists())
+
 
 class TestBotConstants(unittest.TestCase):
     def test_welcome_text_contains_gatherx(self):
@@ -178,6 +242,15 @@ class TestBotConstants(unittest.TestCase):
         for fmt in ["npvt", "ovpn", "ehi", "hc", "hat", "opaque_bundle"]:
             self.assertIn(fmt, SUPPORTED_FORMATS)
 
+    def test_valid_formats_include_derived(self):
+        for fmt in list(SUPPORTED_FORMATS) + ["b64sub", "decoded.json"]:
+            self.assertIn(fmt, _ALL_VALID_FORMATS)
+        self.assertNotIn("zip", _ALL_VALID_FORMATS)
+
+    def test_formats_text_lists_formats(self):
+        for fmt in ["npvt", "b64sub", "decoded.json", "ovpn", "dark"]:
+            self.assertIn(f"`{fmt}`", _FORMATS_TEXT)
+
 
 class TestBotCommandNames(unittest.TestCase):
     def test_all_commands_have_descriptions(self):
@@ -190,6 +263,27 @@ class TestBotCommandNames(unittest.TestCase):
         self.assertEqual(len(names), len(set(names)), "Duplicate bot command names found")
 
 
+class TestBotCommandPattern(unittest.TestCase):
+    def test_every_menu_command_is_routed(self):
+        for cmd in _BOT_COMMANDS:
+            m = _COMMAND_RE.match(f"/{cmd.command}")
+            self.assertIsNotNone(m, f"/{cmd.command} not matched")
+            self.assertEqual(m.group(1), cmd.command)
+
+    def test_arguments_and_bot_mention(self):
+        self.assertEqual(_COMMAND_RE.match("/get b64sub").group(1), "get")
+        self.assertEqual(_COMMAND_RE.match("/GET@GatherXBot").group(1), "GET")
+
+    def test_no_prefix_false_triggers(self):
+        self.assertIsNone(_COMMAND_RE.match("/getall"))
+        self.assertIsNone(_COMMAND_RE.match("/muted"))
+        self.assertIsNone(_COMMAND_RE.match("hello /start"))
+        self.assertIsNone(_COMMAND_RE.match("/get-npvt"))
+        self.assertIsNone(_COMMAND_RE.match("/latest.txt"))
+        self.assertEqual(_COMMAND_RE.match("/latest@GatherXBot 2").group(1), "latest")
+        self.assertEqual(_COMMAND_RE.match("/unmute").group(1), "unmute")
+
+
 class TestBotFilenameMatching(unittest.TestCase):
     def test_matches_internal_and_exported_b64sub_names(self):
         self.assertTrue(InteractiveBot._filename_matches_format("all_sources.npvt.b64sub", "b64sub"))
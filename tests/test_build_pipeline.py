@@ -31,6 +31,50 @@ class TestBuildPipeline(unittest.TestCase):
         self.assertEqual(results[0]["artifact_hash"], "art_hash")
         self.artifact_store.save_output.assert_called_with("route1", "fmt1", b"artifact data")
 
+    def test_build_splits_records_by_format(self):
+        route_config = {"name": "route1", "formats": ["fmt1", "fmt2", "fmt3"], "from_sources": ["src1"]}
+        self.state_repo.get_records_for_build.return_value = [
+            {"record_type": "fmt1", "data": "a"},
+            {"record_type": "fmt2", "data": "b"},
+            {"record_type": "fmt1", "data": "c"},
+        ]
+
+        handler = Mock()
+        handler.build.return_value = b"artifact data"
+        self.registry.get.return_value = handler
+        self.artifact_store.save_artifact.return_value = "art_hash"
+
+        results = self.pipeline.run(route_config)
+
+        self.assertEqual([r["format"] for r in results], ["fmt1", "fmt2"])
+        built = [c.args[0] for c in handler.build.call_args_list]
+        self.assertEqual([[r["data"] for r in recs] for recs in built], [["a", "c"], ["b"]])
+
+    def test_decode_proxy_links(self):
+        import base64
+        import json
+
+        vmess = "vmess://" + base64.b64encode(json.dumps({"add": "h", "port": 443}).encode()).decode()
+        ss = "ss://" + base64.b64encode(b"aes-256-gcm:pw").decode() + "@1.2.3.4:8388#tag"
+        artifact = "\n".join([
+            vmess,
+            ss,
+            "vless://id@host:443?type=ws#name",
+            "hy2://pw@host:8443",
+            "unknown://x",
+            "no scheme here",
+        ]).encode()
+
+        out = json.loads(self.pipeline._decode_proxy_links(artifact))
+
+        self.assertEqual(out["total"], 4)
+        self.assertEqual(out["protocols"], {"vmess": 1, "shadowsocks": 1, "vless": 1, "hysteria2": 1})
+        vm, sh, vl, hy = out["entries"]
+        self.assertEqual(vm["decoded"], {"add": "h", "port": 443})
+        self.assertEqual((sh["method"], sh["password"], sh["port"], sh["tag"]), ("aes-256-gcm", "pw", 8388, "tag"))
+        self.assertEqual((vl["address"], vl["params"], vl["tag"]), ("host", {"type": "ws"}, "name"))
+        self.assertEqual(hy["raw"], "hy2://pw@host:8443")
+
     def test_build_no_records(self):
         route_config = {"name": "route1", "formats": ["fmt1"], "from_sources": ["src1"]}
         self.state_repo.get_records_for_build.return_value = []
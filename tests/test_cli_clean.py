@@ -0,0 +1,73 @@
+import unittest
+import shutil
+import tempfile
+from argparse import Namespace
+from pathlib import Path
+from unittest.mock import patch
+
+from huntx.cli.main import _cmd_clean, _remove_paths
+
+
+class TestCliClean(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_remove_paths_reports_per_item(self):
+        d = self.temp_dir / "raw" / "ab"
+        d.mkdir(parents=True)
+        (d / "blob").write_bytes(b"x")
+        f = self.temp_dir / "state.db"
+        f.write_bytes(b"db")
+
+        results = _remove_paths([self.temp_dir / "raw", f])
+
+        self.assertEqual([err for _, err in results], [None, None])
+        self.assertFalse((self.temp_dir / "raw").exists())
+        self.assertFalse(f.exists())
+
+    def test_remove_paths_collects_errors_inside_running_loop(self):
+        import asyncio
+
+        ok = self.temp_dir / "ok.txt"
+        ok.write_bytes(b"x")
+        bad = self.temp_dir / "bad.txt"
+
+        def remove(p):
+            if p == bad:
+                raise PermissionError("denied")
+            p.unlink()
+
+        async def main():
+            return _remove_paths([ok, bad])
+
+        with patch("huntx.cli.main._remove_path", side_effect=remove):
+            results = asyncio.run(main())
+
+        self.assertEqual(results[0], (ok, None))
+        self.assertIs(results[1][0], bad)
+        self.assertIsInstance(results[1][1], PermissionError)
+        self.assertFalse(ok.exists())
+
+    def test_clean_with_yes_removes_data(self):
+        for name in ("raw", "archive"):
+            (self.temp_dir / name).mkdir()
+            (self.temp_dir / name / "x").write_bytes(b"x")
+        db_path = self.temp_dir / "state" / "state.db"
+        db_path.parent.mkdir()
+        db_path.write_bytes(b"db")
+
+        with patch("huntx.cli.main.paths.DATA_DIR", self.temp_dir), \
+                patch("huntx.cli.main.paths.STATE_DB_PATH", db_path), \
+                patch("builtins.print"):
+            _cmd_clean(Namespace(yes=True))
+
+        self.assertFalse((self.temp_dir / "raw").exists())
+        self.assertFalse((self.temp_dir / "archive").exists())
+        self.assertFalse(db_path.exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,8 +2,11 @@ import unittest
 import os
 import tempfile
 from pathlib import Path
+from unittest.mock import patch
+import yaml
 from huntx.config.loader import load_config
 from huntx.config.schema import AppConfig
+from huntx.config.env_expand import expand_env, recursive_expand
 
 
 class TestConfigLoader(unittest.TestCase):
@@ -123,6 +126,47 @@ class TestConfigLoader(unittest.TestCase):
         with self.assertRaises(FileNotFoundError):
             load_config(Path("non_existent.yaml"))
 
+    def test_load_config_cached_until_file_changes(self):
+        config_content = """
+        sources: []
+        publishing:
+          routes: []
+        """
+        with open(self.config_path, "w") as f:
+            f.write(config_content)
+
+        with patch("huntx.config.loader.yaml.load", wraps=yaml.load) as parse:
+            load_config(self.config_path)
+            load_config(str(self.config_path))
+            self.assertEqual(parse.call_count, 1)
+
+            # Bump mtime: the file must be re-parsed
+            st = os.stat(self.config_path)
+            os.utime(self.config_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+            load_config(self.config_path)
+            self.assertEqual(parse.call_count, 2)
+
+    def test_load_config_sees_env_changes_with_unchanged_file(self):
+        config_content = """
+        sources:
+          - id: env_source
+            type: telegram
+            telegram:
+              token: "${TEST_RELOAD_TOKEN}"
+              chat_id: "-1001"
+            selector:
+              include_formats: ["all"]
+        publishing:
+          routes: []
+        """
+        with open(self.config_path, "w") as f:
+            f.write(config_content)
+
+        with patch.dict(os.environ, {"TEST_RELOAD_TOKEN": "1:aaa"}):
+            self.assertEqual(load_config(self.config_path).sources[0].telegram.token, "1:aaa")
+        with patch.dict(os.environ, {"TEST_RELOAD_TOKEN": "2:bbb"}):
+            self.assertEqual(load_config(self.config_path).sources[0].telegram.token, "2:bbb")
+
     def test_load_config_with_env_vars(self):
         config_content = """
         sources:
@@ -154,6 +198,30 @@ class TestConfigLoader(unittest.TestCase):
             if "TEST_API_HASH_ENV" in os.environ:
                 del os.environ["TEST_API_HASH_ENV"]
 
+    def test_recursive_expand_skips_env_free_branches(self):
+        os.environ["HUNTX_TEST_TOKEN"] = "123:XYZ"
+        try:
+            plain = {"chat_id": "-1001", "formats": ["npvt"]}
+            data = {"plain": plain, "secret": {"token": "${HUNTX_TEST_TOKEN}"}}
+            expanded = recursive_expand(data)
+            self.assertIs(recursive_expand(plain), plain)
+            self.assertIs(expanded["plain"], plain)
+            self.assertEqual(expanded["secret"], {"token": "123:XYZ"})
+        finally:
+            del os.environ["HUNTX_TEST_TOKEN"]
+
+    def test_expand_env_defaults(self):
+        os.environ["HUNTX_TEST_SET"] = "val"
+        try:
+            self.assertEqual(expand_env("${HUNTX_TEST_SET}/x"), "val/x")
+            self.assertEqual(expand_env("${HUNTX_TEST_SET:-other}"), "val")
+            self.assertEqual(expand_env("${HUNTX_TEST_UNSET:-fallback}"), "fallback")
+            self.assertEqual(expand_env("${HUNTX_TEST_UNSET}"), "")
+            os.environ["HUNTX_TEST_SET"] = "changed"
+            self.assertEqual(recursive_expand({"a": "${HUNTX_TEST_SET}"}), {"a": "changed"})
+        finally:
+            del os.environ["HUNTX_TEST_SET"]
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,42 @@
+import unittest
+
+from pydantic import ValidationError
+
+from huntx.config.schema import AppConfig
+from huntx.config.validate import validate_config
+
+
+def _config(source_ids, route_sources):
+    return AppConfig.model_validate({
+        "sources": [
+            {"id": sid, "type": "telegram", "telegram": {"token": "1:A", "chat_id": "-1"}}
+            for sid in source_ids
+        ],
+        "publishing": {
+            "routes": [
+                {"name": "r1", "from_sources": route_sources, "formats": ["npvt"], "destinations": []}
+            ]
+        },
+    })
+
+
+class TestValidateConfig(unittest.TestCase):
+    def test_valid_config(self):
+        validate_config(_config(["a", "b"], ["a", "b"]))
+
+    def test_duplicate_source_id(self):
+        with self.assertRaisesRegex(ValueError, "Duplicate source ID: b"):
+            validate_config(_config(["a", "b", "c", "b"], ["a"]))
+
+    def test_unknown_route_source(self):
+        with self.assertRaisesRegex(ValueError, "Route r1 references unknown source x"):
+            validate_config(_config(["a"], ["a", "x", "y"]))
+
+    def test_config_is_immutable(self):
+        config = _config(["a"], ["a"])
+        with self.assertRaises(ValidationError):
+            config.sources[0].id = "b"
+
+
+if __name__ == "__main__":
+    unittest.main()
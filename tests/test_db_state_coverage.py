@@ -26,6 +26,12 @@ class TestDBStateCoverage(unittest.TestCase):
             cursor = conn.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='seen_files';")
             self.assertIsNotNone(cursor.fetchone())
 
+    def test_connections_are_tuned(self):
+        with self.db.connect() as conn:
+            self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+            self.assertEqual(conn.execute("PRAGMA synchronous").fetchone()[0], 1)
+            self.assertEqual(conn.execute("PRAGMA temp_store").fetchone()[0], 2)
+
     def test_update_source_state_bot(self):
         source_id = "bot_src"
         state = {"offset": 100}
@@ -26,6 +26,17 @@ class TestFormatRegistry(unittest.TestCase):
         retrieved = self.registry.get("test_fmt")
         self.assertIs(retrieved, handler)
 
+    def test_new_instance_has_own_handlers(self):
+        handler = Mock()
+        handler.format_id = "test_fmt"
+        self.registry.register(handler)
+
+        FormatRegistry._instance = None
+        fresh = FormatRegistry.get_instance()
+        self.assertIsNot(fresh, self.registry)
+        self.assertEqual(fresh.list_formats(), [])
+        self.assertNotIn("_handlers", vars(FormatRegistry))
+
     def test_get_unknown(self):
         self.assertIsNone(self.registry.get("unknown_fmt"))
 
@@ -1,5 +1,5 @@
 import unittest
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 from huntx.formats.npvt import NpvtHandler
 from huntx.formats.npvtsub import NpvtSubHandler
 from huntx.formats.conf_lines import ConfLinesHandler
@@ -8,6 +8,7 @@ from huntx.formats.ehi import EhiHandler
 from huntx.formats.hc import HcHandler
 from huntx.formats.hat import HatHandler
 from huntx.formats.sip import SipHandler
+from huntx.formats.common.normalize_text import normalize_text
 
 
 class TestFormatsCoverage(unittest.TestCase):
@@ -44,6 +45,10 @@ class TestFormatsCoverage(unittest.TestCase):
         built = fmt.build(lines)
         self.assertEqual(built, b"line1\nline2")
 
+        dup = fmt.parse(b"line1\nline2\n line1 \nline2", {})
+        self.assertEqual([r["data"]["line"] for r in dup], ["line1", "line2"])
+        self.assertEqual(dup[0]["unique_hash"], lines[0]["unique_hash"])
+
     def test_opaque_bundle_format(self):
         mock_store = MagicMock()
         fmt = OpaqueBundleHandler(mock_store)
@@ -56,6 +61,11 @@ class TestFormatsCoverage(unittest.TestCase):
         self.assertEqual(parsed[0]["data"]["filename"], "file.bin")
         self.assertEqual(parsed[0]["data"]["size"], len(data))
 
+        # A RawStore key passed by the transform step is used as-is
+        keyed = fmt.parse(data, {"filename": "file.bin", "raw_hash": "ab" * 32})
+        self.assertEqual(keyed[0]["unique_hash"], "ab" * 32)
+        self.assertEqual(keyed[0]["data"]["blob_hash"], "ab" * 32)
+
         # Build
         mock_store.get.return_value = data
         built = fmt.build(parsed)
@@ -69,6 +79,26 @@ class TestFormatsCoverage(unittest.TestCase):
             self.assertIn("file.bin", zf.namelist())
             self.assertEqual(zf.read("file.bin"), data)
 
+    def test_opaque_bundle_skips_deflate_for_incompressible_blobs(self):
+        import io
+        import os
+        import zipfile
+
+        mock_store = MagicMock()
+        fmt = OpaqueBundleHandler(mock_store)
+        blobs = {"a" * 64: os.urandom(8192), "b" * 64: b"remote 1.2.3.4 443\n" * 500}
+        mock_store.get.side_effect = blobs.get
+        records = [
+            {"data": {"filename": "random.bin", "blob_hash": "a" * 64}},
+            {"data": {"filename": "plain.ovpn", "blob_hash": "b" * 64}},
+        ]
+
+        with zipfile.ZipFile(io.BytesIO(fmt.build(records))) as zf:
+            self.assertEqual(zf.getinfo("random.bin").compress_type, zipfile.ZIP_STORED)
+            self.assertEqual(zf.getinfo("plain.ovpn").compress_type, zipfile.ZIP_DEFLATED)
+            self.assertEqual(zf.read("random.bin"), blobs["a" * 64])
+            self.assertEqual(zf.read("plain.ovpn"), blobs["b" * 64])
+
     def test_npvtsub_format(self):
         fmt = NpvtSubHandler()
         self.assertEqual(fmt.format_id, "npvtsub")
@@ -92,6 +122,29 @@ class TestFormatsCoverage(unittest.TestCase):
         self.assertIn(b"vmess://", built)
         self.assertNotIn(b"garbage", built)
 
+    def test_npvt_base64_detection(self):
+        import base64
+
+        fmt = NpvtHandler()
+        wrapped = base64.encodebytes(b"vless://a@b:1\ntrojan://c@d:2\n" * 4)
+        self.assertEqual(len(fmt.parse(wrapped, {})), 2)
+        # Spaceless non-base64 text never reaches the decoder
+        with patch("huntx.formats.npvt.b64decode") as dec:
+            self.assertEqual(fmt.parse(b"just-a-token_with.dots", {}), [])
+            dec.assert_not_called()
+
+    def test_npvt_embedded_uris(self):
+        fmt = NpvtHandler()
+        content = b"no links here\nget it: VLESS://a@b:1 and trojan://c@d:2#x\nwg://k@e:3"
+        lines = [r["data"]["line"] for r in fmt.parse(content, {})]
+        self.assertEqual(lines, ["VLESS://a@b:1", "trojan://c@d:2", "wg://k@e:3"])
+
+    def test_normalize_text(self):
+        self.assertEqual(normalize_text(""), "")
+        self.assertEqual(normalize_text("  vless://a@b:1 \t"), "vless://a@b:1")
+        # Fullwidth forms fold to ASCII under NFKC
+        self.assertEqual(normalize_text(" \uff56\uff4c\uff45\uff53\uff53://x "), "vless://x")
+
     def test_ehi_handler(self):
         mock_store = MagicMock()
         fmt = EhiHandler(mock_store)
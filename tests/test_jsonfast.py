@@ -0,0 +1,31 @@
+import json
+import unittest
+from unittest.mock import patch
+
+from huntx.utils import jsonfast
+
+
+class TestJsonFast(unittest.TestCase):
+    PAYLOAD = {"offset": 5, "allowed_updates": ["message"], "text": "سلام vless://x"}
+
+    def test_round_trip(self):
+        raw = jsonfast.dumps_bytes(self.PAYLOAD)
+        self.assertIsInstance(raw, bytes)
+        self.assertEqual(json.loads(raw), self.PAYLOAD)
+        self.assertEqual(jsonfast.loads(raw), self.PAYLOAD)
+        self.assertEqual(jsonfast.loads(raw.decode("utf-8")), self.PAYLOAD)
+
+    def test_indented_output_matches_stdlib(self):
+        expected = json.dumps(self.PAYLOAD, indent=2, ensure_ascii=False).encode("utf-8")
+        self.assertEqual(jsonfast.dumps_bytes(self.PAYLOAD, indent=True), expected)
+        with patch.object(jsonfast, "orjson", None):
+            self.assertEqual(jsonfast.dumps_bytes(self.PAYLOAD, indent=True), expected)
+
+    def test_stdlib_fallback(self):
+        with patch.object(jsonfast, "orjson", None):
+            raw = jsonfast.dumps_bytes(self.PAYLOAD)
+            self.assertEqual(jsonfast.loads(raw), self.PAYLOAD)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+import logging
+import os
+import tempfile
+import unittest
+
+from huntx import logging_conf
+from huntx.logging_conf import setup_logging
+
+
+class TestSetupLogging(unittest.TestCase):
+    def setUp(self):
+        self.root = logging.getLogger()
+        self.saved_handlers = self.root.handlers[:]
+        self.saved_level = self.root.level
+        self.tmp = tempfile.TemporaryDirectory()
+        self.log_file = os.path.join(self.tmp.name, "huntx.log")
+
+    def tearDown(self):
+        for h in self.root.handlers[:]:
+            self.root.removeHandler(h)
+            h.close()
+        self.root.handlers = self.saved_handlers
+        self.root.setLevel(self.saved_level)
+        logging_conf._configured = None
+        self.tmp.cleanup()
+
+    def test_repeat_call_keeps_handlers(self):
+        setup_logging(logging.INFO, self.log_file)
+        first = self.root.handlers[:]
+        setup_logging(logging.INFO, self.log_file)
+        self.assertEqual(self.root.handlers, first)
+        self.assertEqual(len(first), 2)
+
+    def test_changed_settings_reconfigure(self):
+        setup_logging(logging.INFO, self.log_file)
+        setup_logging(logging.DEBUG)
+        self.assertEqual(len(self.root.handlers), 1)
+        self.assertEqual(self.root.level, logging.DEBUG)
+
+
+if __name__ == "__main__":
+    unittest.main()
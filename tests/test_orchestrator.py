@@ -1,6 +1,7 @@
+import threading
 import unittest
 from unittest.mock import patch
-from huntx.core.orchestrator import Orchestrator
+from huntx.core.orchestrator import Orchestrator, _close_thread_event_loop, _thread_event_loop
 from huntx.config.schema import (
     AppConfig,
     SourceConfig,
@@ -90,9 +91,17 @@ class TestOrchestrator(unittest.TestCase):
 
         # Verify build
         mock_build_pipeline.run.assert_called_once()
+        route_dict = mock_build_pipeline.run.call_args[0][0]
+        self.assertEqual(route_dict["name"], "route1")
+        self.assertEqual(route_dict["from_sources"], ["src_bot"])
+        self.assertIn("min_seen_file_id", route_dict)
+        self.assertNotIn("min_seen_file_id", orch._route_plans[0][1])
 
         # Verify publish
         MockPub.return_value.run.assert_called_once()
+        dests = MockPub.return_value.run.call_args[0][1]
+        self.assertEqual(dests[0]["chat_id"], "dest1")
+        self.assertEqual(dests[0]["caption_template"], "cap")
 
     @patch("huntx.core.orchestrator.RawStore")
     @patch("huntx.core.orchestrator.ArtifactStore")
@@ -106,3 +115,19 @@ class TestOrchestrator(unittest.TestCase):
     def test_orchestrator_initialization(self, *args):
         orch = Orchestrator(self.config)
         self.assertIsNotNone(orch)
+
+    def test_thread_event_loop_reused_until_closed(self):
+        seen = {}
+
+        def worker():
+            first = _thread_event_loop()
+            seen["reused"] = _thread_event_loop() is first
+            _close_thread_event_loop()
+            seen["closed"] = first.is_closed()
+            seen["fresh"] = _thread_event_loop() is not first
+            _close_thread_event_loop()
+
+        t = threading.Thread(target=worker)
+        t.start()
+        t.join()
+        self.assertEqual(seen, {"reused": True, "closed": True, "fresh": True})
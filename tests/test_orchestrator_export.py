@@ -0,0 +1,119 @@
+import base64
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from huntx.core.orchestrator import Orchestrator
+
+
+class TestExportOutputs(unittest.TestCase):
+    def setUp(self):
+        self._cwd = os.getcwd()
+        self._tmp = tempfile.TemporaryDirectory()
+        os.chdir(self._tmp.name)
+        self.orch = SimpleNamespace(
+            config=SimpleNamespace(routes=[SimpleNamespace(name="main")]),
+            _output_filename=Orchestrator._output_filename,
+            _write_output=Orchestrator._write_output,
+        )
+
+    def tearDown(self):
+        os.chdir(self._cwd)
+        self._tmp.cleanup()
+
+    def test_writes_bytes_and_text_payloads(self):
+        results = [
+            {"route_name": "main", "format": "npvt", "data": "vless://a\nvless://b\n"},
+            {"route_name": "main", "format": "ovpn", "data": b"\x00\x01"},
+            {"route_name": "main", "format": "npvt.b64sub", "data": "dmxlc3M6Ly9h"},
+            {"route_name": "main", "format": "hc", "data": b""},
+        ]
+        Orchestrator._export_outputs(self.orch, results)
+
+        out = Path("outputs")
+        self.assertEqual((out / "main.npvt").read_text(encoding="utf-8"), "vless://a\nvless://b\n")
+        self.assertEqual((out / "main.ovpn").read_bytes(), b"\x00\x01")
+        self.assertTrue((out / "main_npvt_b64sub.txt").exists())
+        self.assertFalse((out / "main.hc").exists())
+
+    def test_failed_write_does_not_stop_other_files(self):
+        Path("outputs").mkdir()
+        Path("outputs/main.npvt").mkdir()  # a directory cannot be overwritten as a file
+        results = [
+            {"route_name": "main", "format": "npvt", "data": "x"},
+            {"route_name": "main", "format": "ovpn", "data": b"y"},
+        ]
+        with self.assertLogs("huntx.core.orchestrator", level="ERROR"):
+            Orchestrator._export_outputs(self.orch, results)
+
+        self.assertEqual(Path("outputs/main.ovpn").read_bytes(), b"y")
+
+    def test_output_filenames(self):
+        self.assertEqual(Orchestrator._output_filename("main", "npvt"), "main.npvt")
+        self.assertEqual(Orchestrator._output_filename("main", "npvt.decoded.json"), "main_npvt_decoded.json")
+        self.assertEqual(Orchestrator._output_filename("main", "npvt.b64sub"), "main_npvt_b64sub.txt")
+
+    def test_removes_stale_route_files_only(self):
+        out = Path("outputs")
+        out.mkdir()
+        (out / "main.old").write_text("stale")
+        (out / "README.md").write_text("keep")
+
+        Orchestrator._export_outputs(self.orch, [{"route_name": "main", "format": "npvt", "data": "x"}])
+
+        self.assertFalse((out / "main.old").exists())
+        self.assertTrue((out / "README.md").exists())
+        self.assertTrue((out / "main.npvt").exists())
+
+
+class TestExportDevOutputs(unittest.TestCase):
+    def setUp(self):
+        self._cwd = os.getcwd()
+        self._tmp = tempfile.TemporaryDirectory()
+        os.chdir(self._tmp.name)
+        self.repo = MagicMock()
+        self.orch = SimpleNamespace(
+            config=SimpleNamespace(sources=[SimpleNamespace(id="s1")]),
+            repo=self.repo,
+        )
+
+    def tearDown(self):
+        os.chdir(self._cwd)
+        self._tmp.cleanup()
+
+    def test_manifest_accumulates_across_runs(self):
+        self.repo.get_record_lines_for_build.return_value = ["vless://a@h:1#x", "not a uri", ""]
+        Orchestrator._export_dev_outputs(self.orch)
+        self.repo.get_record_lines_for_build.return_value = ["trojan://b@h:2"]
+        Orchestrator._export_dev_outputs(self.orch)
+
+        dev = Path("outputs_dev")
+        manifest = json.loads((dev / "_manifest.json").read_bytes())
+        self.assertEqual(set(manifest), {"vless://a@h:1", "trojan://b@h:2"})
+
+        data = json.loads((dev / "proxies.json").read_text(encoding="utf-8"))
+        self.assertEqual(data["_count"], 2)
+        self.assertEqual(len(data["proxies"]), 2)
+        lines = [l for l in (dev / "proxies.txt").read_text(encoding="utf-8").splitlines() if "://" in l]
+        self.assertEqual(len(lines), 2)
+        b64 = (dev / "proxies_b64sub.txt").read_bytes()
+        self.assertEqual(base64.b64decode(b64.strip()).decode("utf-8").splitlines(), lines)
+
+    def test_corrupt_manifest_starts_fresh(self):
+        dev = Path("outputs_dev")
+        dev.mkdir()
+        (dev / "_manifest.json").write_bytes(b"{not json")
+        self.repo.get_record_lines_for_build.return_value = ["vless://a@h:1"]
+
+        with self.assertLogs("huntx.core.orchestrator", level="WARNING"):
+            Orchestrator._export_dev_outputs(self.orch)
+
+        self.assertEqual(list(json.loads((dev / "_manifest.json").read_bytes())), ["vless://a@h:1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -9,6 +9,18 @@ class TestRouter(unittest.TestCase):
         self.assertEqual(decide_format("config.npv4", b""), "npv4")
         self.assertEqual(decide_format("something.conf", b""), "conf_lines")
 
+    def test_extension_needs_a_dot(self):
+        # A bare name equal to an extension is not that format
+        self.assertEqual(decide_format("conf", b""), "opaque_bundle")
+        self.assertEqual(decide_format("archive.tar.dark", b""), "dark")
+
+    def test_content_based_base64_subscription(self):
+        import base64
+
+        content = base64.b64encode(b"vless://uuid@host:443\ntrojan://pw@host:443\n")
+        self.assertEqual(decide_format("sub.txt", content), "npvt")
+        self.assertEqual(decide_format("blob.bin", base64.b64encode(b"x" * 64)), "opaque_bundle")
+
     def test_extension_ehi(self):
         self.assertEqual(decide_format("tunnel.ehi", b""), "ehi")
         self.assertEqual(decide_format("TUNNEL.EHI", b""), "ehi")
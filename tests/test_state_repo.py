@@ -1,7 +1,7 @@
 import unittest
 import sqlite3
 import logging
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 from huntx.state.repo import StateRepo
 
 
@@ -79,6 +79,14 @@ class TestStateRepo(unittest.TestCase):
         retrieved = self.repo.get_source_state("src1")
         self.assertEqual(retrieved, state)
 
+    def test_source_states_bulk_fetch(self):
+        self.assertEqual(self.repo.get_source_states([]), {})
+        self.repo.update_source_state("src1", {"offset": 1})
+        self.repo.update_source_state("src2", {"offset": 2})
+
+        states = self.repo.get_source_states(["src1", "src2", "missing"])
+        self.assertEqual(states, {"src1": {"offset": 1}, "src2": {"offset": 2}})
+
     def test_record_file_persistence(self):
         source_id = "src1"
         ext_id = "101"
@@ -145,6 +153,42 @@ class TestStateRepo(unittest.TestCase):
         self.assertEqual(len(records), 1)
         self.assertEqual(records[0]["data"], {"line": "second"})
 
+    def test_get_record_lines_for_build(self):
+        self.repo.record_file("src1", "101", "rawhash1", 100, "file1.txt")
+        self.repo.add_record("rawhash1", "fmt1", "u1", {"line": "vless://a"})
+        self.repo.add_record("rawhash1", "fmt1", "u2", {"blob_hash": "x"})
+        self.repo.add_record("rawhash1", "fmt1", "u1", {"line": "vless://a"})
+
+        self.assertEqual(self.repo.get_record_lines_for_build(["fmt1"], ["src1"]), ["vless://a"])
+        self.assertEqual(self.repo.get_record_lines_for_build(["fmt1"], ["src2"]), [])
+
+    def _conn_raising_on_json_extract(self, message):
+        conn = MagicMock()
+
+        def execute(query, args=()):
+            if "json_extract" in query:
+                raise sqlite3.OperationalError(message)
+            return self.conn.execute(query, args)
+
+        conn.execute.side_effect = execute
+        self.mock_db_conn.connect.return_value.__enter__.return_value = conn
+
+    def test_get_record_lines_falls_back_without_json1(self):
+        self.repo.record_file("src1", "101", "rawhash1", 100, "file1.txt")
+        self.repo.add_record("rawhash1", "fmt1", "u1", {"line": "vless://a"})
+        self._conn_raising_on_json_extract("no such function: json_extract")
+
+        self.assertEqual(self.repo.get_record_lines_for_build(["fmt1"], ["src1"]), ["vless://a"])
+
+    def test_get_record_lines_other_operational_error_not_retried(self):
+        self.repo.record_file("src1", "101", "rawhash1", 100, "file1.txt")
+        self.repo.add_record("rawhash1", "fmt1", "u1", {"line": "vless://a"})
+        self._conn_raising_on_json_extract("database is locked")
+
+        with patch.object(self.repo, "get_records_for_build") as fallback:
+            self.assertEqual(self.repo.get_record_lines_for_build(["fmt1"], ["src1"]), [])
+        fallback.assert_not_called()
+
     def test_published_artifacts_tracking(self):
         route = "route1"
         h = "art_hash_1"
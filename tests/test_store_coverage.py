@@ -1,3 +1,5 @@
+import os
+import time
 import unittest
 import shutil
 import tempfile
@@ -52,6 +54,18 @@ class TestStoreCoverage(unittest.TestCase):
         path = store.save_output("route1", "txt", b"out_content")
         self.assertTrue(Path(path).exists())
 
+    def test_list_archive_newest_first_within_window(self):
+        store = ArtifactStore(base_dir=self.base_dir)
+        now = time.time()
+        for name, age in (("r_1.npvt", 3600), ("r_2.npvt", 60), ("r_3.npvt", 10 * 86400)):
+            p = store.archive_dir / name
+            p.write_bytes(b"x")
+            os.utime(p, (now - age, now - age))
+        (store.archive_dir / "subdir").mkdir()
+
+        names = [p.name for p in store.list_archive(days=4)]
+        self.assertEqual(names, ["r_2.npvt", "r_1.npvt"])
+
     def test_raw_store_exceptions(self):
         store = RawStore(base_dir=self.base_dir)
 
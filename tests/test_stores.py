@@ -3,6 +3,7 @@ import shutil
 import tempfile
 import os
 from pathlib import Path
+from types import SimpleNamespace
 from huntx.store.raw_store import RawStore
 from huntx.store.artifact_store import ArtifactStore
 
@@ -27,6 +28,15 @@ class TestRawStore(unittest.TestCase):
         self.assertIsNone(self.store.get("nonexistent"))
         self.assertFalse(self.store.exists("nonexistent"))
 
+    def test_prune_processed_skips_missing_blobs(self):
+        kept = self.store.save(b"kept")
+        gone = self.store.save(b"gone")
+        repo = SimpleNamespace(get_processed_hashes=lambda: [gone, "ab" + "0" * 62])
+
+        self.assertEqual(self.store.prune_processed(repo), 1)
+        self.assertFalse(self.store.exists(gone))
+        self.assertTrue(self.store.exists(kept))
+
 
 class TestArtifactStore(unittest.TestCase):
     def setUp(self):
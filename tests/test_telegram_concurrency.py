@@ -1,3 +1,5 @@
+import threading
+import time
 import unittest
 import json
 from unittest.mock import patch, MagicMock
@@ -8,6 +10,7 @@ class TestTelegramConcurrency(unittest.TestCase):
     def setUp(self):
         # Reset shared state to ensure test isolation
         TelegramConnector._shared_state = {}
+        TelegramConnector._file_paths.clear()
 
         self.updates = [
             {
@@ -74,7 +77,7 @@ class TestTelegramConcurrency(unittest.TestCase):
 
         return resp_mock
 
-    @patch("urllib.request.urlopen")
+    @patch("huntx.connectors.telegram.connector._BotApiSession.open")
     @patch("time.sleep")  # Skip sleeps
     def test_shared_state_concurrency(self, mock_sleep, mock_urlopen):
         mock_urlopen.side_effect = self.mock_urlopen
@@ -99,6 +102,43 @@ class TestTelegramConcurrency(unittest.TestCase):
         self.assertEqual(len(items2), 1, "Source 2 should find 1 item")
         self.assertEqual(items2[0].metadata["file_id"], "f2")
 
+    def test_sources_on_one_bot_poll_one_at_a_time(self):
+        in_flight = {"now": 0, "peak": 0, "polls": 0}
+        guard = threading.Lock()
+
+        def fake_request(method, params=None):
+            if method == "getUpdates" and "allowed_updates" in params:
+                with guard:
+                    in_flight["now"] += 1
+                    in_flight["polls"] += 1
+                    in_flight["peak"] = max(in_flight["peak"], in_flight["now"])
+                time.sleep(0.05)
+                with guard:
+                    in_flight["now"] -= 1
+                return {"ok": True, "result": self.updates}
+            if method == "getUpdates":
+                return {"ok": True, "result": []}
+            return {"ok": True, "result": {"file_path": params["file_id"]}}
+
+        results = {}
+
+        def run(chat_id):
+            conn = TelegramConnector("token", chat_id)
+            with patch.object(conn, "_make_request", side_effect=fake_request), \
+                    patch.object(conn, "_download_file", side_effect=lambda path: path.encode()):
+                results[chat_id] = [i.metadata["file_id"] for i in conn.list_new()]
+
+        threads = [threading.Thread(target=run, args=(chat,)) for chat in ("-1001", "-1002")]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(results, {"-1001": ["f1"], "-1002": ["f2"]})
+        self.assertEqual(in_flight["peak"], 1)
+        # The second source reuses the backlog the first one drained
+        self.assertEqual(in_flight["polls"], 1)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,15 +1,37 @@
+import http.client
+import io
+import http.server
+import threading
 import unittest
 import json
+import urllib.request
 from unittest.mock import patch, MagicMock
-from urllib.error import URLError
-from huntx.connectors.telegram.connector import TelegramConnector
+from urllib.error import HTTPError, URLError
+from huntx.connectors.telegram.connector import MAX_BACKOFF, TelegramConnector, _BotApiSession, _retry_delay
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    connections = set()
+
+    def do_GET(self):
+        _Handler.connections.add(self.client_address)
+        status = 404 if self.path == "/missing" else 200
+        body = b"payload"
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
 
 
 class TestTelegramConnector(unittest.TestCase):
     def setUp(self):
         self.connector = TelegramConnector("token", "123")
 
-    @patch("urllib.request.urlopen")
+    @patch("huntx.connectors.telegram.connector._BotApiSession.open")
     def test_make_request_retry_success(self, mock_urlopen):
         # Setup mock to raise URLError twice, then return success
         success_response = MagicMock()
@@ -27,7 +49,7 @@ class TestTelegramConnector(unittest.TestCase):
         # Since currently there are NO retries, this test will fail (call_count will be 1)
         self.assertEqual(mock_urlopen.call_count, 3)
 
-    @patch("urllib.request.urlopen")
+    @patch("huntx.connectors.telegram.connector._BotApiSession.open")
     def test_download_file_retry_success(self, mock_urlopen):
         # Setup mock to raise URLError twice, then return success
         success_response = MagicMock()
@@ -44,5 +66,69 @@ class TestTelegramConnector(unittest.TestCase):
         self.assertEqual(mock_urlopen.call_count, 3)
 
 
+class TestTokenValidation(unittest.TestCase):
+    def test_warns_only_for_malformed_tokens(self):
+        logger = "huntx.connectors.telegram.connector"
+        with self.assertNoLogs(logger, level="WARNING"):
+            TelegramConnector("123456:" + "A" * 35, "1")
+        for bad in ("", "no-colon", "abc:" + "A" * 35, "123:short", "1BVtsOK4Bu2" + "x" * 300):
+            with self.assertLogs(logger, level="WARNING"):
+                TelegramConnector(bad, "1")
+
+
+class TestRetryDelay(unittest.TestCase):
+    def _http_error(self, code, headers=None, body=b""):
+        return HTTPError("https://api.telegram.org", code, "err", headers or {}, io.BytesIO(body))
+
+    def test_backoff_is_jittered_and_capped(self):
+        for attempt in range(3):
+            delay = _retry_delay(attempt, URLError("down"))
+            self.assertGreaterEqual(delay, 0.5 * 2**attempt)
+            self.assertLessEqual(delay, 1.5 * 2**attempt)
+        self.assertLessEqual(_retry_delay(20), MAX_BACKOFF)
+
+    def test_429_honours_retry_after_header(self):
+        self.assertEqual(_retry_delay(0, self._http_error(429, {"Retry-After": "7"})), 7.0)
+
+    def test_429_honours_retry_after_in_body(self):
+        body = json.dumps({"ok": False, "error_code": 429, "parameters": {"retry_after": 3}}).encode()
+        self.assertEqual(_retry_delay(0, self._http_error(429, body=body)), 3.0)
+
+
+class TestBotApiSession(unittest.TestCase):
+    def setUp(self):
+        _Handler.connections = set()
+        self.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base = f"https://127.0.0.1:{self.server.server_address[1]}"
+        # Plain HTTP stands in for TLS; the session logic is the same.
+        patcher = patch("http.client.HTTPSConnection", http.client.HTTPConnection)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        proxies = patch("urllib.request.getproxies", return_value={})
+        proxies.start()
+        self.addCleanup(proxies.stop)
+        self.session = _BotApiSession()
+
+    def tearDown(self):
+        self.session.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_connection_reused_across_requests(self):
+        for _ in range(3):
+            with self.session.open(urllib.request.Request(f"{self.base}/ok"), timeout=5) as resp:
+                self.assertEqual(resp.read(), b"payload")
+        self.assertEqual(len(_Handler.connections), 1)
+
+    def test_error_status_raises_http_error(self):
+        with self.assertRaises(HTTPError) as ctx:
+            self.session.open(urllib.request.Request(f"{self.base}/missing"), timeout=5)
+        self.assertEqual(ctx.exception.code, 404)
+        # The connection stays usable after an error response
+        with self.session.open(urllib.request.Request(f"{self.base}/ok"), timeout=5) as resp:
+            self.assertEqual(resp.read(), b"payload")
+
+
 if __name__ == "__main__":
     unittest.main()
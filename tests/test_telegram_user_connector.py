@@ -299,6 +299,85 @@ class TestTelegramUserConnector(unittest.TestCase):
             args, kwargs = mock_client.iter_messages.call_args
             self.assertEqual(args[0], "-10012345")
 
+    def test_peer_entity_resolved_once_per_client(self):
+        client = MagicMock()
+        client.get_entity.return_value = MagicMock(id=12345)
+        client.is_connected.return_value = True
+        self._set_mock_client(client)
+        self.connector.peer = "-10012345"
+
+        self.assertEqual(self.connector.resolve_channel_id(), 12345)
+        self.connector._resolve_peer(self.connector.peer, client)
+        self.connector._resolve_peer(self.connector.peer, client)
+
+        client.get_entity.assert_called_once_with(-10012345)
+
+    def test_document_downloads_overlap_and_keep_order(self):
+        import asyncio
+
+        loop = asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+        active = {"now": 0, "peak": 0}
+
+        async def download_media(msg, file=None):
+            active["now"] += 1
+            active["peak"] = max(active["peak"], active["now"])
+            await asyncio.sleep(0.01 * (6 - msg.id))  # later ids finish first
+            active["now"] -= 1
+            if msg.id == 3:
+                raise ValueError("boom")
+            return f"doc{msg.id}".encode()
+
+        msgs = []
+        for i in range(1, 6):
+            msg = MagicMock()
+            msg.id = i
+            msg.document = True
+            msg.file.size = 10
+            msg.file.name = f"{i}.txt"
+            msg.date = datetime.datetime.now()
+            msgs.append(msg)
+
+        client = MagicMock()
+        client.loop = loop
+        client.iter_messages.return_value = msgs
+        # Mirror telethon.sync: run to completion unless already inside the loop
+        client.download_media.side_effect = lambda msg, file=None: (
+            download_media(msg, file) if loop.is_running() else loop.run_until_complete(download_media(msg, file))
+        )
+        stats = {"media_messages": 0, "download_errors": 0}
+
+        items = list(self.connector._fetch_document_pass(client, "peer", 0, 0, stats))
+
+        self.assertEqual([i.external_id for i in items], ["1_media", "2_media", "4_media", "5_media"])
+        self.assertEqual(items[0].data, b"doc1")
+        self.assertEqual(stats["download_errors"], 1)
+        self.assertGreater(active["peak"], 1)
+
+    def test_cancelled_document_download_counted_as_error(self):
+        import asyncio
+
+        msgs = []
+        for i in range(1, 4):
+            msg = MagicMock()
+            msg.id = i
+            msg.document = True
+            msg.file.size = 10
+            msg.file.name = f"{i}.txt"
+            msg.date = datetime.datetime.now()
+            msgs.append(msg)
+
+        client = MagicMock()
+        client.iter_messages.return_value = msgs
+        stats = {"media_messages": 0, "download_errors": 0}
+        results = [b"doc1", asyncio.CancelledError(), b"doc3"]
+
+        with patch.object(self.connector, "_download_many", return_value=results):
+            items = list(self.connector._fetch_document_pass(client, "peer", 0, 0, stats))
+
+        self.assertEqual([i.external_id for i in items], ["1_media", "3_media"])
+        self.assertEqual(stats["download_errors"], 1)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -34,6 +34,7 @@ class TestTransformPipeline(unittest.TestCase):
         self.assertEqual(result["status_update"], ("processed", None, "hash123"))
         self.raw_store.get.assert_called_with("hash123")
         handler.parse.assert_called_once()
+        self.assertEqual(handler.parse.call_args[0][1]["raw_hash"], "hash123")
 
     def test_process_single_file_missing_data(self):
         """Missing raw data should return failed status."""